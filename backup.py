@@ -0,0 +1,137 @@
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+import database as db
+
+# Set up a logger for the backup module
+logger = logging.getLogger(__name__)
+
+BACKUP_DIR = os.getenv("BACKUP_DIR", "data/backups")
+# Number of backups kept; older ones are deleted after each successful backup.
+BACKUP_RETAIN = int(os.getenv("BACKUP_RETAIN", 7))
+BACKUP_INTERVAL_HOURS = float(os.getenv("BACKUP_INTERVAL_HOURS", 24))
+# The copy is done a few pages at a time, pausing in between so the bot's own
+# writes are never held up for long. sqlite3's own sleep argument only applies
+# when a step finds the database busy or locked, so the pause between
+# successful steps is done in the progress callback; no lock is held there.
+PAGES_PER_STEP = 64
+STEP_SLEEP = 0.05
+# A write from another connection restarts the copy from the first page. After
+# this many restarts the pauses are dropped so a busy bot can't starve it.
+PACED_RESTARTS = 2
+
+
+def _step_pacer():
+    """Returns a progress callback for Connection.backup that paces the copy."""
+    last_remaining = None
+    restarts = 0
+
+    def pace(status: int, remaining: int, total: int):
+        nonlocal last_remaining, restarts
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+        last_remaining = remaining
+        if remaining and restarts < PACED_RESTARTS:
+            time.sleep(STEP_SLEEP)
+
+    return pace
+
+
+class BackupResult:
+    """Outcome of one backup run."""
+
+    def __init__(self, path: str, size: int, duration: float, ok: bool, error=None):
+        self.path = path
+        self.size = size
+        self.duration = duration
+        self.ok = ok
+        self.error = error
+
+
+def run_backup() -> BackupResult:
+    """
+    Copies the live database to BACKUP_DIR with SQLite's online backup API,
+    verifies the copy with PRAGMA integrity_check and rotates old backups.
+    Blocking; call it through asyncio.to_thread.
+    """
+    started = time.perf_counter()
+    name = datetime.now(timezone.utc).strftime("flatool-%Y%m%d-%H%M%S.db")
+    path = os.path.join(BACKUP_DIR, name)
+    partial_path = path + ".partial"
+    source = target = None
+    try:
+        os.makedirs(BACKUP_DIR, exist_ok=True)
+        source = sqlite3.connect(db.DATABASE_FILE)
+        target = sqlite3.connect(partial_path)
+        source.backup(
+            target,
+            pages=PAGES_PER_STEP,
+            progress=_step_pacer(),
+            sleep=STEP_SLEEP,
+        )
+        target.close()
+        target = None
+
+        verify = sqlite3.connect(f"file:{partial_path}?mode=ro", uri=True)
+        try:
+            integrity = verify.execute("PRAGMA integrity_check").fetchone()[0]
+        finally:
+            verify.close()
+        if integrity != "ok":
+            raise sqlite3.DatabaseError(f"integrity check failed: {integrity}")
+
+        os.replace(partial_path, path)
+        size = os.path.getsize(path)
+        duration = time.perf_counter() - started
+        logger.info(f"Database backed up to '{path}' ({size} bytes, {duration:.2f}s).")
+        rotate_backups()
+        return BackupResult(path, size, duration, True)
+    except (sqlite3.Error, OSError) as e:
+        logger.error(f"Error backing up database: {e}", exc_info=True)
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        return BackupResult(path, 0, time.perf_counter() - started, False, str(e))
+    finally:
+        if target:
+            target.close()
+        if source:
+            source.close()
+
+
+def list_backups() -> list:
+    """Returns the paths of all finished backups, oldest first."""
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    return sorted(
+        os.path.join(BACKUP_DIR, name)
+        for name in os.listdir(BACKUP_DIR)
+        if name.startswith("flatool-") and name.endswith(".db")
+    )
+
+
+def seconds_until_due() -> float:
+    """
+    Seconds until the next backup is due, counted from the newest existing
+    backup. 0 if there is none or the interval has already passed.
+    """
+    backups = list_backups()
+    if not backups:
+        return 0.0
+    try:
+        age = time.time() - os.path.getmtime(backups[-1])
+    except OSError:
+        return 0.0
+    return max(0.0, BACKUP_INTERVAL_HOURS * 3600 - age)
+
+
+def rotate_backups(retain: int = BACKUP_RETAIN):
+    """Deletes all but the newest `retain` backups."""
+    backups = list_backups()
+    for path in backups[: max(0, len(backups) - retain)]:
+        try:
+            os.remove(path)
+            logger.info(f"Removed old backup '{path}'.")
+        except OSError as e:
+            logger.error(f"Error removing old backup '{path}': {e}")
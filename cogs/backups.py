@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import discord
+from discord.ext import commands
+import backup
+
+logger = logging.getLogger(__name__)
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class Backups(commands.Cog):
+    """
+    Online backups of the bot's SQLite database, taken on a schedule and on
+    demand while the bot keeps running.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._lock = asyncio.Lock()  # one backup at a time
+        # Keep the cadence across restarts: without this every boot would take
+        # a backup, and frequent redeploys would rotate the daily ones away.
+        self.bot.jobs.register(
+            "database_backup",
+            self.scheduled_backup,
+            backup.BACKUP_INTERVAL_HOURS * 3600,
+            delay=backup.seconds_until_due(),
+        )
+
+    def cog_unload(self):
+        self.bot.jobs.unregister("database_backup")
+
+    async def take_backup(self) -> backup.BackupResult:
+        async with self._lock:
+            return await asyncio.to_thread(backup.run_backup)
+
+    async def scheduled_backup(self):
+        result = await self.take_backup()
+        if not result.ok:
+            # Raising lets the job scheduler back off and show the error in /debug jobs.
+            raise RuntimeError(f"Scheduled backup failed: {result.error}")
+
+    @commands.has_permissions(administrator=True)
+    @commands.slash_command(
+        name="backup",
+        description="Back up the bot's database now and report the result.",
+    )
+    async def backup_now(self, ctx: discord.ApplicationContext):
+        await ctx.defer(ephemeral=True)
+        result = await self.take_backup()
+        if result.ok:
+            await ctx.followup.send(
+                f"Backup `{result.path}` written and verified in {result.duration:.2f}s "
+                f"({format_size(result.size)}). "
+                f"{len(backup.list_backups())} backups kept.",
+                ephemeral=True,
+            )
+            logger.info(f"Manual backup triggered by {ctx.author}.")
+        else:
+            await ctx.followup.send(
+                f"Backup failed after {result.duration:.2f}s: {result.error}",
+                ephemeral=True,
+            )
+
+
+def setup(bot):
+    bot.add_cog(Backups(bot))
@@ -2,6 +2,8 @@ import discord
 from discord.ext import commands
 import logging
 import random
+from logconfig import LogAggregator
+from restscheduler import RequestShed
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,7 @@ class Cats(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.cat_chance = 1
+        self.log_stats = LogAggregator(logger, "Cat meows")
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -26,23 +29,32 @@ class Cats(commands.Cog):
                         if resp.status == 200:
                             data = await resp.json()
                             if data and "url" in data[0]:
-                                await message.reply(data[0]["url"])
-                                logger.info("Sent a cat gif.")
+                                await self.bot.rest.reply(message, data[0]["url"])
+                                self.log_stats.count("cats_sent")
+                                logger.debug("Sent a cat gif.")
                             else:
                                 logger.warning(
                                     "Cat API response did not contain a URL."
                                 )
                         else:
                             logger.error(f"Cat API returned status code {resp.status}")
+                except RequestShed:
+                    self.log_stats.count("cats_shed")
                 except Exception as e:
                     logger.exception("Exception occurred while fetching cat gif.")
                 self.cat_chance = 1
             else:
                 self.cat_chance += 1
-            logger.info(
-                f"Detected 'meow' in message from {message.author}. Cat chance is now {round(self.cat_chance * 0.1, 1)}%"
+            self.log_stats.count("meows")
+            logger.debug(
+                "Detected 'meow' in message from %s. Cat chance is now %.1f%%",
+                message.author,
+                self.cat_chance * 0.1,
             )
 
+    def cog_unload(self):
+        self.log_stats.flush()
+
 
 def setup(bot: commands.Bot):
     bot.add_cog(Cats(bot))
@@ -2,6 +2,8 @@ import logging
 import discord
 from discord.ext import commands
 import database as db  # Make sure this import path matches your project structure
+from logconfig import LogAggregator
+from restscheduler import RequestShed
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,9 @@ class Counting(commands.Cog):
         else:
             self.counting_channel_id = None
             self.count_value = None
+        # Per-message outcomes are aggregated; details are only logged at DEBUG.
+        self.log_stats = LogAggregator(logger, "Counting messages")
+        self.bot.status_cache.register("counting", self.status_payload)
         logger.info(
             "Counting cog initialized with channel_id=%s, count_value=%s",
             self.counting_channel_id,
@@ -28,6 +33,34 @@ class Counting(commands.Cog):
         logger.info("%s cog loaded.", self.__class__.__name__)
         print(f"{self.__class__.__name__} cog loaded.")
 
+    def status_payload(self) -> dict:
+        return {
+            "channel_id": (
+                str(self.counting_channel_id) if self.counting_channel_id else None
+            ),
+            "value": self.count_value,
+            "next": self.count_value + 1 if self.count_value is not None else None,
+        }
+
+    def snapshot_state(self) -> dict:
+        return {"channel_id": self.counting_channel_id, "value": self.count_value}
+
+    def restore_snapshot(self, state: dict, age: float):
+        # Every accepted count is written to the database, so it stays
+        # authoritative; the snapshot only serves as a consistency check.
+        if (state.get("channel_id"), state.get("value")) != (
+            self.counting_channel_id,
+            self.count_value,
+        ):
+            logger.warning(
+                "Counting snapshot (channel_id=%s, value=%s) disagrees with the database "
+                "(channel_id=%s, value=%s); keeping the database values.",
+                state.get("channel_id"),
+                state.get("value"),
+                self.counting_channel_id,
+                self.count_value,
+            )
+
     @commands.has_permissions(manage_guild=True)
     @commands.slash_command(name="setchannel")
     async def set_counting_channel(
@@ -35,6 +68,7 @@ class Counting(commands.Cog):
     ):
         db.create_counting_row(channel.id, starting_count)
         self.counting_channel_id, self.count_value = db.get_counting_row()
+        self.bot.status_cache.invalidate("counting")
         logger.info(
             "Counting channel set to %s and counter set to %d by %s",
             channel.id,
@@ -57,28 +91,42 @@ class Counting(commands.Cog):
         try:
             number = int(message.content.strip())
         except ValueError:
-            logger.warning(
+            self.log_stats.count("rejected_non_integer")
+            logger.debug(
                 "Non-integer message deleted in counting channel by %s: %s",
                 message.author,
                 message.content,
             )
-            await message.delete()
+            await self._delete(message)
             return
 
         if number != self.count_value + 1:
-            logger.warning(
+            self.log_stats.count("rejected_incorrect")
+            logger.debug(
                 "Incorrect count by %s: %s (expected %d)",
                 message.author,
                 message.content,
                 self.count_value + 1,
             )
-            await message.delete()
+            await self._delete(message)
             return
 
         self.count_value = number
         db.update_counting_value(number)
+        self.bot.status_cache.invalidate("counting")
+
+        self.log_stats.count("accepted")
+        logger.debug("Count updated to %d by %s", number, message.author)
+
+    async def _delete(self, message: discord.Message):
+        try:
+            await self.bot.rest.delete_message(message)
+        except RequestShed:
+            self.log_stats.count("delete_shed")
 
-        logger.info("Count updated to %d by %s", number, message.author)
+    def cog_unload(self):
+        self.log_stats.flush()
+        self.bot.status_cache.unregister("counting")
 
 
 def setup(bot: commands.Bot):
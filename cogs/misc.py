@@ -1,7 +1,23 @@
+import asyncio
+import logging
+import re
+import time
 import discord
+from discord import SlashCommandGroup
 from discord.ext import commands
 from discord.ext.commands import Greedy
 from discord.ext import tasks
+import database as db
+from restscheduler import Priority, RequestShed, retry_request
+
+logger = logging.getLogger(__name__)
+
+# Broadcast tuning: sends in flight per guild and overall, and the retry policy
+BROADCAST_PER_GUILD = 2
+BROADCAST_MAX_CONCURRENCY = 10
+BROADCAST_MAX_ATTEMPTS = 5
+BROADCAST_BACKOFF = 1.0  # seconds before the first retry, doubled every retry
+CHANNEL_ID_PATTERN = re.compile(r"\d{15,20}")
 
 
 class Misc(commands.Cog):  # create a class for our cog that inherits from commands.Cog
@@ -11,6 +27,19 @@ class Misc(commands.Cog):  # create a class for our cog that inherits from comma
         self, bot
     ):  # this is a special method that is called when the cog is loaded
         self.bot = bot
+        self._broadcasts = {}  # broadcast id -> task, for runs in progress
+
+    debug_commands = SlashCommandGroup("debug", "Diagnostics for bot administrators.")
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Resume broadcasts that were interrupted by a restart.
+        for job in await asyncio.to_thread(db.get_unfinished_broadcasts):
+            if job["id"] in self._broadcasts:
+                continue
+            remaining = len(job["targets"]) - len(job["delivered"]) - len(job["failed"])
+            logger.info(f"Resuming broadcast {job['id']} ({remaining} targets left).")
+            self._start_broadcast(job)
 
     @commands.has_permissions(administrator=True)
     @commands.slash_command(
@@ -23,8 +52,191 @@ class Misc(commands.Cog):  # create a class for our cog that inherits from comma
         message: str,
         channel: discord.Option(discord.TextChannel, "Channel to send the message to"),
     ):
-        await channel.send(message)
-        await ctx.respond(f"Message sent to {channel.mention}.", ephemeral=True)
+        # The send is queued and paced, which can outlast the 3 second deadline.
+        await ctx.defer(ephemeral=True)
+        try:
+            await self.bot.rest.send(channel, message, priority=Priority.INTERACTION)
+        except RequestShed as e:
+            await ctx.followup.send(
+                f"Message not sent, the bot is too busy right now: {e}", ephemeral=True
+            )
+            return
+        except discord.HTTPException as e:
+            await ctx.followup.send(
+                f"Could not send the message to {channel.mention}: {e.status} {e.text}",
+                ephemeral=True,
+            )
+            return
+        await ctx.followup.send(f"Message sent to {channel.mention}.", ephemeral=True)
+
+    @commands.has_permissions(administrator=True)
+    @commands.slash_command(
+        name="broadcast",
+        description="Send a message to many channels at once.",
+    )
+    async def broadcast(
+        self,
+        ctx: discord.ApplicationContext,
+        message: str,
+        channels: discord.Option(
+            str, "Channel mentions or IDs, separated by spaces", default=None
+        ),
+        category: discord.Option(
+            discord.CategoryChannel,
+            "Send to every text channel in this category",
+            default=None,
+        ),
+        all_guilds: discord.Option(
+            bool,
+            "Send to one channel in every server the bot is in (bot owner only)",
+            default=False,
+        ),
+    ):
+        await ctx.defer(ephemeral=True)
+        is_owner = await self.bot.is_owner(ctx.author)
+        if all_guilds and not is_owner:
+            await ctx.followup.send(
+                "Only the bot owner can broadcast to every server.", ephemeral=True
+            )
+            return
+
+        targets = []
+        if channels:
+            for channel_id in CHANNEL_ID_PATTERN.findall(channels):
+                channel = self.bot.get_channel(int(channel_id))
+                # Admins may only target their own server's channels.
+                if channel and (is_owner or channel.guild.id == ctx.guild.id):
+                    targets.append(channel.id)
+        if category:
+            targets.extend(channel.id for channel in category.text_channels)
+        if all_guilds:
+            for guild in self.bot.guilds:
+                channel = self._announcement_channel(guild)
+                if channel:
+                    targets.append(channel.id)
+        targets = list(dict.fromkeys(targets))  # drop duplicates, keep order
+
+        if not targets:
+            await ctx.followup.send(
+                "No target channels found. Pass channels, a category or all_guilds.",
+                ephemeral=True,
+            )
+            return
+
+        started_at = time.time()
+        broadcast_id = await asyncio.to_thread(
+            db.create_broadcast, message, ctx.channel.id, targets, started_at
+        )
+        if broadcast_id is None:
+            await ctx.followup.send(
+                "Could not record the broadcast, nothing was sent.", ephemeral=True
+            )
+            return
+        await ctx.followup.send(
+            f"Broadcast #{broadcast_id} started to {len(targets)} channels.",
+            ephemeral=True,
+        )
+        logger.info(
+            f"Broadcast {broadcast_id} to {len(targets)} channels started by {ctx.author}."
+        )
+        job = {
+            "id": broadcast_id,
+            "message": message,
+            "origin_channel_id": ctx.channel.id,
+            "targets": targets,
+            "delivered": [],
+            "failed": {},
+            "started_at": started_at,
+        }
+        self._start_broadcast(job, ctx)
+
+    def _announcement_channel(self, guild: discord.Guild):
+        """The system channel if the bot may post there, else the first one it may."""
+        candidates = [guild.system_channel] + list(guild.text_channels)
+        for channel in candidates:
+            if channel and channel.permissions_for(guild.me).send_messages:
+                return channel
+        return None
+
+    def _start_broadcast(self, job: dict, ctx: discord.ApplicationContext = None):
+        task = asyncio.create_task(self._run_broadcast(job, ctx))
+        self._broadcasts[job["id"]] = task
+        task.add_done_callback(lambda _: self._broadcasts.pop(job["id"], None))
+
+    async def _run_broadcast(self, job: dict, ctx: discord.ApplicationContext = None):
+        delivered = list(job["delivered"])
+        failed = dict(job["failed"])
+        done = set(delivered) | set(failed)
+        overall_limit = asyncio.Semaphore(BROADCAST_MAX_CONCURRENCY)
+        guild_limits = {}
+        checkpoint_lock = asyncio.Lock()
+
+        async def deliver(channel_id: int):
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                error = "channel not found"
+            else:
+                guild_limit = guild_limits.setdefault(
+                    channel.guild.id, asyncio.Semaphore(BROADCAST_PER_GUILD)
+                )
+                async with guild_limit, overall_limit:
+                    error = await retry_request(
+                        lambda: self.bot.rest.send(channel, job["message"]),
+                        BROADCAST_MAX_ATTEMPTS,
+                        BROADCAST_BACKOFF,
+                    )
+            if error is None:
+                delivered.append(channel_id)
+            else:
+                failed[channel_id] = error
+            # Checkpoint every result so a restart never re-sends a delivered target.
+            async with checkpoint_lock:
+                await asyncio.to_thread(
+                    db.update_broadcast, job["id"], list(delivered), dict(failed)
+                )
+
+        await asyncio.gather(
+            *(
+                deliver(channel_id)
+                for channel_id in job["targets"]
+                if channel_id not in done
+            )
+        )
+        finished_at = time.time()
+        await asyncio.to_thread(
+            db.update_broadcast, job["id"], delivered, failed, finished_at
+        )
+        await self._report_broadcast(
+            job, delivered, failed, finished_at - job["started_at"], ctx
+        )
+
+    async def _report_broadcast(
+        self, job: dict, delivered: list, failed: dict, elapsed: float, ctx
+    ):
+        summary = (
+            f"Broadcast #{job['id']} finished in {elapsed:.1f}s: delivered to "
+            f"{len(delivered)}/{len(job['targets'])} channels, {len(failed)} failed."
+        )
+        logger.info(summary)
+        if failed:
+            summary += "\n" + "\n".join(
+                f"<#{channel_id}>: {error}" for channel_id, error in failed.items()
+            )
+        if len(summary) > 2000:
+            summary = summary[:1997] + "..."
+
+        if ctx is not None:
+            try:
+                await ctx.followup.send(summary, ephemeral=True)
+                return
+            except discord.HTTPException:
+                pass  # interaction token expired on a long run
+        origin = self.bot.get_channel(job["origin_channel_id"])
+        if origin:
+            try:
+                await self.bot.rest.send(origin, summary, priority=Priority.INTERACTION)
+            except (discord.HTTPException, RequestShed) as e:
+                logger.error(f"Could not report broadcast {job['id']}: {e}")
 
     @commands.slash_command(
         name="ping",
@@ -32,7 +244,61 @@ class Misc(commands.Cog):  # create a class for our cog that inherits from comma
     )
     async def ping(self, ctx: discord.ApplicationContext):
         latency = round(self.bot.latency * 1000)
-        await ctx.respond(f"Pong! 🏓 Latency: {latency}ms")
+        p50, p99, worst = self.bot.watchdog.lag_percentiles()
+        await ctx.respond(
+            f"Pong! 🏓 Latency: {latency}ms\n"
+            f"Event loop lag (last minute): p50 {p50 * 1000:.1f}ms, "
+            f"p99 {p99 * 1000:.1f}ms, max {worst * 1000:.1f}ms. "
+            f"{len(self.bot.watchdog.stalls)} recent stalls, see `/debug stalls`."
+        )
+
+    @debug_commands.command(
+        name="jobs", description="Show the bot's background jobs and their schedule."
+    )
+    @commands.has_permissions(administrator=True)
+    async def debug_jobs(self, ctx: discord.ApplicationContext):
+        embed = discord.Embed(
+            title="Background jobs", color=discord.Color.from_rgb(255, 255, 255)
+        )
+        for job in sorted(self.bot.jobs.jobs.values(), key=lambda j: j.next_run):
+            if job.running:
+                status = "running now"
+            else:
+                status = f"next run <t:{int(job.next_run_at)}:R>"
+            lines = [f"Every {job.interval / 60:g} min, {status}", f"Runs: {job.runs}"]
+            if job.last_duration is not None:
+                lines.append(f"Last duration: {job.last_duration * 1000:.0f}ms")
+            if job.last_error:
+                lines.append(
+                    f"Failing ({job.failures} in a row): {job.last_error}"[:300]
+                )
+            embed.add_field(name=job.name, value="\n".join(lines), inline=False)
+        await ctx.respond(embed=embed, ephemeral=True)
+
+    @debug_commands.command(
+        name="stalls", description="Show recent event loop stalls and what caused them."
+    )
+    @commands.has_permissions(administrator=True)
+    async def debug_stalls(self, ctx: discord.ApplicationContext):
+        stalls = list(self.bot.watchdog.stalls)[-5:]
+        embed = discord.Embed(
+            title="Recent event loop stalls",
+            color=discord.Color.orange() if stalls else discord.Color.green(),
+        )
+        if not stalls:
+            embed.description = (
+                f"No stalls over {self.bot.watchdog.threshold * 1000:.0f}ms recorded."
+            )
+        for stall in reversed(stalls):
+            stack = stall.stack
+            if len(stack) > 1000:
+                stack = "..." + stack[-997:]  # keep the innermost frames
+            embed.add_field(
+                name=f"{stall.duration * 1000:.0f}ms, <t:{int(stall.started_at)}:R>",
+                value=f"```{stack}```"[:1024],
+                inline=False,
+            )
+        await ctx.respond(embed=embed, ephemeral=True)
 
 
 def setup(bot):  # this is called by Pycord to setup the cog
@@ -0,0 +1,155 @@
+import gzip
+import json
+import logging
+import os
+import time
+import discord
+from discord.ext import commands
+import database as db
+
+logger = logging.getLogger(__name__)
+
+# Path of the recording; the cog is only loaded when this is set.
+RECORD_FILE = os.getenv("EVENT_RECORD_FILE")
+FORMAT_VERSION = 1
+# Message contents are dropped unless they are a plain integer (counting)
+# or contain one of these keywords (cats). Everything else becomes "x" * len.
+KEEP_KEYWORDS = ("meow",)
+MAX_CONTENT_LENGTH = 64
+FLUSH_EVERY = 500
+
+
+def anonymize_content(content: str) -> str:
+    """
+    Reduces a message to what our cogs actually look at, so recordings never
+    contain real conversation text.
+    """
+    stripped = content.strip()
+    try:
+        int(stripped)
+        return stripped
+    except ValueError:
+        pass
+    lowered = content.lower()
+    for keyword in KEEP_KEYWORDS:
+        if keyword in lowered:
+            return keyword
+    return "x" * min(len(content), MAX_CONTENT_LENGTH)
+
+
+def read_events(path: str):
+    """
+    Reads a recording written by EventRecorder.
+    Returns (header, iterator of events); events are dicts with a relative
+    timestamp "t" in milliseconds and an event type "e".
+    """
+    fh = gzip.open(path, "rt", encoding="utf-8")
+    header = json.loads(fh.readline())
+    if header.get("v") != FORMAT_VERSION:
+        fh.close()
+        raise ValueError(f"Unsupported recording version: {header.get('v')}")
+
+    def events():
+        with fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+    return header, events()
+
+
+class EventRecorder(commands.Cog):
+    """
+    Writes a compact, anonymized stream of the gateway events our cogs consume
+    (MESSAGE_CREATE, GUILD_MEMBER_UPDATE) to a gzipped JSON-lines file.
+    Snowflakes are replaced with small per-recording pseudonyms.
+    Replay recordings with replay.py.
+    """
+
+    def __init__(self, bot, path: str):
+        self.bot = bot
+        self.path = path
+        self._ids = {}
+        self._started = time.monotonic()
+        self._pending = 0
+        self.events_written = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+        header = {"v": FORMAT_VERSION, "started_at": int(time.time())}
+        counting_info = db.get_counting_row()
+        if counting_info is not None:
+            header["counting"] = {
+                "channel": self._pseudonym(counting_info[0]),
+                "value": counting_info[1],
+            }
+        self._write(header)
+        logger.info("Recording gateway events to %s", path)
+
+    def cog_unload(self):
+        self._file.close()
+        logger.info(
+            "Stopped recording gateway events (%d events written to %s).",
+            self.events_written,
+            self.path,
+        )
+
+    def _pseudonym(self, snowflake):
+        if snowflake is None:
+            return None
+        pseudonym = self._ids.get(snowflake)
+        if pseudonym is None:
+            pseudonym = self._ids[snowflake] = len(self._ids) + 1
+        return pseudonym
+
+    def _roles(self, member: discord.Member):
+        return [[self._pseudonym(role.id), role.position] for role in member.roles]
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, separators=(",", ":")))
+        self._file.write("\n")
+
+    def _record(self, record: dict):
+        record["t"] = int((time.monotonic() - self._started) * 1000)
+        self._write(record)
+        self.events_written += 1
+        self._pending += 1
+        if self._pending >= FLUSH_EVERY:
+            self._file.flush()
+            self._pending = 0
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        self._record(
+            {
+                "e": "m",
+                "g": self._pseudonym(message.guild.id if message.guild else None),
+                "c": self._pseudonym(message.channel.id),
+                "a": self._pseudonym(message.author.id),
+                "b": int(message.author.bot),
+                "x": anonymize_content(message.content),
+            }
+        )
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        self._record(
+            {
+                "e": "u",
+                "g": self._pseudonym(after.guild.id),
+                "a": self._pseudonym(after.id),
+                "b": int(after.bot),
+                "r0": self._roles(before),
+                "r1": self._roles(after),
+            }
+        )
+
+
+def setup(bot: commands.Bot):
+    if not RECORD_FILE:
+        logger.warning("EVENT_RECORD_FILE is not set; event recorder not loaded.")
+        return
+    bot.add_cog(EventRecorder(bot, RECORD_FILE))
@@ -1,8 +1,29 @@
+import asyncio
+import hashlib
+import json
+import time
 import discord
 from discord.commands import SlashCommandGroup, Option
-from discord.ext import commands, tasks
+from discord.ext import commands
 import logging
 import database as db
+from restscheduler import Priority, RequestShed, retry_request
+from rolehistory import RoleHistory, render_chart
+
+# Seconds to wait after a tracked role change before refreshing the embed,
+# so a burst of role updates results in a single edit.
+REFRESH_DELAY = 30
+# The periodic update skips edits while the embed content is unchanged, but
+# still edits at least this often, so the 'Last updated' footer advances and a
+# deleted embed message is noticed (the edit raises NotFound).
+EMBED_MAX_UNCHANGED = 6 * 3600
+
+# Bulk role jobs: role changes in flight per job, how often progress is
+# checkpointed and shown, and the retry policy for failed changes.
+BULK_CONCURRENCY = 4
+BULK_PROGRESS_INTERVAL = 5.0  # seconds
+BULK_MAX_ATTEMPTS = 4
+BULK_BACKOFF = 2.0  # seconds before the first retry, doubled every retry
 
 
 class RoleTracker(commands.Cog):
@@ -18,6 +39,24 @@ class RoleTracker(commands.Cog):
         self.role_embed_message = None
         # Load config from database
         self.config = db.load_config()
+        # Tracker index: role id -> ids of members whose highest tracked role it is
+        self.member_index = {}
+        # Digest of the embed content last sent, used to skip no-op edits
+        self.embed_digest = None
+        self._embed_edited_at = None  # time.monotonic() of the last edit
+        self._restored_message_id = None
+        self._refresh_task = None
+        # Member count history of tracked roles, see /role_tracker stats
+        self.history = RoleHistory()
+        # Bulk role jobs in progress: guild id -> job dict
+        self.bulk_jobs = {}
+        self.bot.status_cache.register("roles", self.status_payload)
+        # Periodic work runs on the bot's job scheduler
+        self.bot.jobs.register("role_embed_update", self.update_role_embed, 3600)
+        self.bot.jobs.register("role_history_sample", self.sample_role_history, 300)
+        self.bot.jobs.register(
+            "role_history_rollup", self.rollup_role_history, 3600, delay=300
+        )
 
     role_tracker_commands = SlashCommandGroup(
         "role_tracker", "Commands related to tracking roles and members."
@@ -26,8 +65,6 @@ class RoleTracker(commands.Cog):
     @commands.Cog.listener()
     async def on_ready(self):
         self.logger.info(f"Logged in as {self.bot.user} (ID: {self.bot.user.id})")
-        self.logger.info("Starting role embed update task...")
-        self.update_role_embed.start()
 
         if (
             self.config["role_embed_channel_id"]
@@ -35,7 +72,22 @@ class RoleTracker(commands.Cog):
         ):
             try:
                 channel = self.bot.get_channel(self.config["role_embed_channel_id"])
-                if channel:
+                if (
+                    channel
+                    and self._restored_message_id
+                    == self.config["role_embed_message_id"]
+                ):
+                    # Warm restart: trust the snapshot instead of fetching the message,
+                    # then reconcile the embed with live data in the background.
+                    self.role_embed_message = channel.get_partial_message(
+                        self._restored_message_id
+                    )
+                    self._restored_message_id = None
+                    self._schedule_refresh(channel.guild, delay=0, reconcile=True)
+                    self.logger.info(
+                        f"Using role embed message from snapshot in channel: {channel.name}"
+                    )
+                elif channel:
                     self.role_embed_message = await channel.fetch_message(
                         self.config["role_embed_message_id"]
                     )
@@ -62,6 +114,200 @@ class RoleTracker(commands.Cog):
                 )
                 self.role_embed_message = None
 
+        # Resume bulk role jobs that were interrupted by a restart.
+        for job in await asyncio.to_thread(db.get_unfinished_bulk_role_jobs):
+            if job["guild_id"] in self.bulk_jobs:
+                continue
+            self.logger.info(
+                f"Resuming bulk role job {job['id']} "
+                f"({len(job['targets']) - job['position']} targets left)."
+            )
+            self._start_bulk_job(job)
+
+    def snapshot_state(self) -> dict:
+        return {
+            "channel_id": self.config["role_embed_channel_id"],
+            "message_id": (
+                self.role_embed_message.id if self.role_embed_message else None
+            ),
+            "embed_digest": self.embed_digest,
+            "member_index": {
+                str(role_id): sorted(member_ids)
+                for role_id, member_ids in self.member_index.items()
+            },
+        }
+
+    def restore_snapshot(self, state: dict, age: float):
+        if not state.get("message_id") or (
+            state.get("channel_id"),
+            state.get("message_id"),
+        ) != (
+            self.config["role_embed_channel_id"],
+            self.config["role_embed_message_id"],
+        ):
+            self.logger.warning(
+                "Snapshot does not match the stored role embed config. Ignoring it."
+            )
+            return
+        self._restored_message_id = state["message_id"]
+        self.embed_digest = state.get("embed_digest")
+        self.member_index = {
+            int(role_id): set(member_ids)
+            for role_id, member_ids in state.get("member_index", {}).items()
+        }
+        self.bot.status_cache.invalidate("roles")
+
+    def status_payload(self) -> dict:
+        """Tracked roles and their members, as shown in the embed, for the status API."""
+        guild = self.role_embed_message.guild if self.role_embed_message else None
+        roles = []
+        for role_id, member_ids in self.member_index.items():
+            role = guild.get_role(role_id) if guild else None
+            members = []
+            for member_id in sorted(member_ids):
+                member = guild.get_member(member_id) if guild else None
+                members.append(
+                    {
+                        "id": str(member_id),
+                        "name": member.display_name if member else None,
+                    }
+                )
+            roles.append(
+                {
+                    "id": str(role_id),
+                    "name": role.name if role else None,
+                    "position": role.position if role else 0,
+                    "member_count": len(members),
+                    "members": members,
+                }
+            )
+        roles.sort(key=lambda r: r["position"], reverse=True)
+        return {
+            "guild_id": str(guild.id) if guild else None,
+            "embed_title": self.config["embed_title"],
+            "roles": roles,
+        }
+
+    @staticmethod
+    def digest_embed(embed: discord.Embed) -> str:
+        """Digest of an embed's content, ignoring the 'Last updated' footer."""
+        data = embed.to_dict()
+        data.pop("footer", None)
+        return hashlib.sha1(
+            json.dumps(data, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _trackable_role_ids(self, guild: discord.Guild) -> set:
+        if self.config["roles_to_track"]:
+            return set(self.config["roles_to_track"])
+        return {role.id for role in guild.roles}
+
+    def _index_member(self, member: discord.Member, trackable_role_ids: set):
+        for member_ids in self.member_index.values():
+            member_ids.discard(member.id)
+        member_trackable_roles = [
+            role for role in member.roles if role.id in trackable_role_ids
+        ]
+        if member_trackable_roles:
+            highest_role = max(member_trackable_roles, key=lambda r: r.position)
+            self.member_index.setdefault(highest_role.id, set()).add(member.id)
+        self.bot.status_cache.invalidate("roles")
+
+    def _is_indexed(self, member_id: int) -> bool:
+        return any(member_id in member_ids for member_ids in self.member_index.values())
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        # The status view shows names; the embed uses mentions and doesn't care.
+        if before.display_name != after.display_name and self._is_indexed(after.id):
+            self.bot.status_cache.invalidate("roles")
+        if before.roles == after.roles or not self.role_embed_message:
+            return
+        embed_guild = self.role_embed_message.guild
+        if not embed_guild or after.guild.id != embed_guild.id:
+            return
+        trackable_role_ids = self._trackable_role_ids(after.guild)
+        changed_role_ids = {role.id for role in before.roles} ^ {
+            role.id for role in after.roles
+        }
+        if not changed_role_ids & trackable_role_ids:
+            return
+        self._index_member(after, trackable_role_ids)
+        # Members touched by a bulk job are refreshed once, when the job ends.
+        bulk_job = self.bulk_jobs.get(after.guild.id)
+        if bulk_job and after.id in bulk_job["target_set"]:
+            return
+        self._schedule_refresh(after.guild)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        # Username and global display name changes don't fire on_member_update.
+        if before.display_name != after.display_name and self._is_indexed(after.id):
+            self.bot.status_cache.invalidate("roles")
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if after.id in self.member_index and (
+            before.name != after.name or before.position != after.position
+        ):
+            self.bot.status_cache.invalidate("roles")
+
+    def _schedule_refresh(
+        self, guild: discord.Guild, delay: float = REFRESH_DELAY, reconcile=False
+    ):
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(
+            self._delayed_refresh(guild, delay, reconcile)
+        )
+
+    async def _delayed_refresh(self, guild: discord.Guild, delay: float, reconcile):
+        await asyncio.sleep(delay)
+        if reconcile and not await self._confirm_embed_message():
+            return
+        previous_index = self.member_index
+        await self._update_embed_now(guild, force=False)
+        if reconcile:
+            drift = sum(
+                len(previous_index.get(role_id, set()) ^ member_ids)
+                for role_id, member_ids in self.member_index.items()
+            )
+            self.logger.info(
+                f"Reconciled role tracker snapshot with live data ({drift} member entries differed)."
+            )
+
+    async def _confirm_embed_message(self) -> bool:
+        """
+        Fetches the embed message restored from a snapshot, which may have been
+        deleted while the bot was down. Returns False if it is gone.
+        """
+        if not self.role_embed_message:
+            return False
+        try:
+            self.role_embed_message = (
+                await self.role_embed_message.channel.fetch_message(
+                    self.role_embed_message.id
+                )
+            )
+            return True
+        except discord.NotFound:
+            self.logger.warning(
+                "Role embed message from the snapshot no longer exists. Resetting reference. "
+                "Use /role_tracker set_embed to set it up again."
+            )
+            self.role_embed_message = None
+            self.embed_digest = None
+            self.config["role_embed_channel_id"] = None
+            self.config["role_embed_message_id"] = None
+            db.save_config(self.config)
+            return False
+        except discord.HTTPException as e:
+            # Not conclusive; the edit below reports lasting problems itself.
+            self.logger.error(
+                f"Could not verify the role embed message from the snapshot: {e}"
+            )
+            return True
+
     def build_role_embed(self, guild: discord.Guild) -> discord.Embed:
         embed = discord.Embed(
             title=self.config["embed_title"],
@@ -96,6 +342,7 @@ class RoleTracker(commands.Cog):
             return embed
 
         members_by_highest_role = {role_id: [] for role_id in trackable_roles}
+        member_index = {role_id: set() for role_id in trackable_roles}
 
         for member in guild.members:
             member_trackable_roles = [
@@ -105,6 +352,9 @@ class RoleTracker(commands.Cog):
                 member_trackable_roles.sort(key=lambda r: r.position, reverse=True)
                 highest_role = member_trackable_roles[0]
                 members_by_highest_role[highest_role.id].append(member.mention)
+                member_index[highest_role.id].add(member.id)
+        self.member_index = member_index
+        self.bot.status_cache.invalidate("roles")
 
         sorted_roles = sorted(
             trackable_roles.values(), key=lambda r: r.position, reverse=True
@@ -173,6 +423,8 @@ class RoleTracker(commands.Cog):
 
             new_message = await channel.send(embed=initial_embed)
             self.role_embed_message = new_message
+            self.embed_digest = self.digest_embed(initial_embed)
+            self._embed_edited_at = time.monotonic()
 
             self.config["role_embed_channel_id"] = channel.id
             self.config["role_embed_message_id"] = new_message.id
@@ -328,14 +580,22 @@ class RoleTracker(commands.Cog):
             "Role member embed update triggered successfully.", ephemeral=True
         )
 
-    async def _update_embed_now(self, guild: discord.Guild):
+    async def _update_embed_now(self, guild: discord.Guild, force: bool = True):
         if not self.role_embed_message:
             self.logger.warning("No role embed message found to update.")
             return
 
         try:
             updated_embed = self.build_role_embed(guild)
-            await self.role_embed_message.edit(embed=updated_embed)
+            digest = self.digest_embed(updated_embed)
+            if not force and digest == self.embed_digest:
+                self.logger.debug("Role embed content unchanged. Skipping edit.")
+                return
+            await self.bot.rest.edit_message(
+                self.role_embed_message, embed=updated_embed
+            )
+            self.embed_digest = digest
+            self._embed_edited_at = time.monotonic()
             self.logger.info(
                 f"Successfully force-updated role embed in channel {self.role_embed_message.channel.name}"
             )
@@ -357,7 +617,11 @@ class RoleTracker(commands.Cog):
                 exc_info=True,
             )
 
-    @tasks.loop(minutes=60)
+    def cog_unload(self):
+        for job in ("role_embed_update", "role_history_sample", "role_history_rollup"):
+            self.bot.jobs.unregister(job)
+        self.bot.status_cache.unregister("roles")
+
     async def update_role_embed(self):
         await self.bot.wait_until_ready()
 
@@ -411,7 +675,21 @@ class RoleTracker(commands.Cog):
 
             try:
                 updated_embed = self.build_role_embed(guild)
-                await self.role_embed_message.edit(embed=updated_embed)
+                digest = self.digest_embed(updated_embed)
+                if (
+                    digest == self.embed_digest
+                    and self._embed_edited_at is not None
+                    and time.monotonic() - self._embed_edited_at < EMBED_MAX_UNCHANGED
+                ):
+                    self.logger.info(
+                        "Role embed content unchanged since the last update. Skipping edit."
+                    )
+                    return
+                await self.bot.rest.edit_message(
+                    self.role_embed_message, embed=updated_embed
+                )
+                self.embed_digest = digest
+                self._embed_edited_at = time.monotonic()
                 self.logger.info(
                     f"Successfully updated role embed in channel {self.role_embed_message.channel.name} at {discord.utils.utcnow()}."
                 )
@@ -437,10 +715,392 @@ class RoleTracker(commands.Cog):
                 "No role embed message available to update. Use /role_tracker set_embed to set it up."
             )
 
-    @update_role_embed.before_loop
-    async def before_update_role_embed(self):
-        await self.bot.wait_until_ready()
-        self.logger.info("Waiting for bot to be ready before starting update loop...")
+    async def sample_role_history(self):
+        counts = {}
+        for role_id in self.config["roles_to_track"]:
+            for guild in self.bot.guilds:
+                role = guild.get_role(role_id)
+                if role:
+                    counts[role.id] = len(role.members)
+                    break
+        if not counts:
+            return
+        await asyncio.to_thread(self.history.record, counts)
+
+    async def rollup_role_history(self):
+        await asyncio.to_thread(self.history.rollup)
+
+    @role_tracker_commands.command(
+        name="stats", description="Show how a tracked role's membership grew over time."
+    )
+    @commands.has_permissions(manage_roles=True)
+    async def role_stats(
+        self,
+        ctx: discord.ApplicationContext,
+        role: Option(discord.Role, "The role to show history for.", required=True),
+        days: Option(
+            int, "How many days to look back.", default=30, min_value=1, max_value=1825
+        ),
+    ):
+        await ctx.defer(ephemeral=True)
+        started = time.perf_counter()
+        points = await asyncio.to_thread(
+            self.history.query, role.id, time.time() - days * 86400
+        )
+        query_ms = (time.perf_counter() - started) * 1000
+        if not points:
+            await ctx.followup.send(
+                f"No history recorded for `{role.name}` yet. "
+                "Tracked roles are sampled every 5 minutes.",
+                ephemeral=True,
+            )
+            return
+
+        values = [value for _, value in points]
+        embed = discord.Embed(
+            title=f"{role.name} membership, last {days} days",
+            description=f"```\n{render_chart(points)}\n```",
+            color=role.color,
+        )
+        embed.add_field(name="Now", value=str(len(role.members)))
+        embed.add_field(name="Change", value=f"{values[-1] - values[0]:+d}")
+        embed.add_field(name="Range", value=f"{min(values)} – {max(values)}")
+        embed.set_footer(text=f"{len(points)} samples, queried in {query_ms:.1f}ms")
+        await ctx.followup.send(embed=embed, ephemeral=True)
+        self.logger.info(f"Showed {days} day membership stats for role {role.name}.")
+
+    @role_tracker_commands.command(
+        name="bulk_assign",
+        description="Give a role to every member matching a filter.",
+    )
+    @commands.has_permissions(manage_roles=True)
+    async def bulk_assign(
+        self,
+        ctx: discord.ApplicationContext,
+        role: Option(discord.Role, "The role to give.", required=True),
+        members_with: Option(
+            discord.Role, "Only members who have this role.", default=None
+        ),
+        members_without: Option(
+            discord.Role, "Only members who don't have this role.", default=None
+        ),
+        include_bots: Option(bool, "Include bot accounts.", default=False),
+    ):
+        await self._bulk_command(
+            ctx, "add", role, members_with, members_without, include_bots
+        )
+
+    @role_tracker_commands.command(
+        name="bulk_remove",
+        description="Take a role away from every member matching a filter.",
+    )
+    @commands.has_permissions(manage_roles=True)
+    async def bulk_remove(
+        self,
+        ctx: discord.ApplicationContext,
+        role: Option(discord.Role, "The role to take away.", required=True),
+        members_with: Option(
+            discord.Role, "Only members who have this role.", default=None
+        ),
+        members_without: Option(
+            discord.Role, "Only members who don't have this role.", default=None
+        ),
+        include_bots: Option(bool, "Include bot accounts.", default=False),
+    ):
+        await self._bulk_command(
+            ctx, "remove", role, members_with, members_without, include_bots
+        )
+
+    @role_tracker_commands.command(
+        name="bulk_cancel",
+        description="Stop the bulk role job running in this server.",
+    )
+    @commands.has_permissions(manage_roles=True)
+    async def bulk_cancel(self, ctx: discord.ApplicationContext):
+        job = self.bulk_jobs.get(ctx.guild.id)
+        if not job:
+            await ctx.respond("No bulk role job is running.", ephemeral=True)
+            return
+        job["cancelled"] = True
+        await ctx.respond(
+            f"Bulk role job #{job['id']} will stop after the changes in flight.",
+            ephemeral=True,
+        )
+        self.logger.info(f"Bulk role job {job['id']} cancelled by {ctx.author}.")
+
+    async def _bulk_command(
+        self,
+        ctx: discord.ApplicationContext,
+        action: str,
+        role: discord.Role,
+        members_with: discord.Role,
+        members_without: discord.Role,
+        include_bots: bool,
+    ):
+        await ctx.defer(ephemeral=True)
+        guild = ctx.guild
+        if guild.id in self.bulk_jobs:
+            await ctx.followup.send(
+                f"Bulk role job #{self.bulk_jobs[guild.id]['id']} is still running. "
+                "Wait for it or use `/role_tracker bulk_cancel`.",
+                ephemeral=True,
+            )
+            return
+        if not guild.me.guild_permissions.manage_roles:
+            await ctx.followup.send(
+                "I need the Manage Roles permission to change roles.", ephemeral=True
+            )
+            return
+        if not role.is_assignable():
+            await ctx.followup.send(
+                f"I can't manage `{role.name}`: it is managed by an integration "
+                "or not below my highest role.",
+                ephemeral=True,
+            )
+            return
+        if ctx.author.id != guild.owner_id and role >= ctx.author.top_role:
+            await ctx.followup.send(
+                "You can only bulk manage roles below your highest role.",
+                ephemeral=True,
+            )
+            return
+
+        if not guild.chunked:
+            await guild.chunk()
+        want_role = action == "add"
+        targets = [
+            member.id
+            for member in guild.members
+            if (include_bots or not member.bot)
+            and (members_with is None or member.get_role(members_with.id))
+            and (members_without is None or not member.get_role(members_without.id))
+            and (member.get_role(role.id) is None) == want_role
+        ]
+        if not targets:
+            await ctx.followup.send("No members match, nothing to do.", ephemeral=True)
+            return
+
+        started_at = time.time()
+        try:
+            progress_message = await self.bot.rest.send(
+                ctx.channel,
+                f"Bulk role job starting for {len(targets)} members...",
+                priority=Priority.INTERACTION,
+            )
+        except (discord.HTTPException, RequestShed) as e:
+            await ctx.followup.send(
+                f"Could not post the progress message, nothing was changed: {e}",
+                ephemeral=True,
+            )
+            return
+        job_id = await asyncio.to_thread(
+            db.create_bulk_role_job,
+            guild.id,
+            role.id,
+            action,
+            ctx.author.id,
+            ctx.channel.id,
+            progress_message.id,
+            targets,
+            started_at,
+        )
+        if job_id is None:
+            self.bot.rest.delete_message(progress_message)
+            await ctx.followup.send(
+                "Could not record the bulk role job, nothing was changed.",
+                ephemeral=True,
+            )
+            return
+        await ctx.followup.send(
+            f"Bulk role job #{job_id} started for {len(targets)} members. "
+            f"Progress: {progress_message.jump_url}",
+            ephemeral=True,
+        )
+        self.logger.info(
+            f"Bulk role job {job_id} ({action} {role.name}) for {len(targets)} members "
+            f"started by {ctx.author}."
+        )
+        self._start_bulk_job(
+            {
+                "id": job_id,
+                "guild_id": guild.id,
+                "role_id": role.id,
+                "action": action,
+                "started_by": ctx.author.id,
+                "channel_id": ctx.channel.id,
+                "message_id": progress_message.id,
+                "targets": targets,
+                "position": 0,
+                "changed": 0,
+                "unchanged": 0,
+                "failed": {},
+                "started_at": started_at,
+            }
+        )
+
+    def _start_bulk_job(self, job: dict):
+        job["target_set"] = set(job["targets"])
+        job["cancelled"] = False
+        self.bulk_jobs[job["guild_id"]] = job
+        task = asyncio.create_task(self._run_bulk_job(job))
+        task.add_done_callback(lambda _: self._forget_bulk_job(job))
+
+    def _forget_bulk_job(self, job: dict):
+        if self.bulk_jobs.get(job["guild_id"]) is job:
+            del self.bulk_jobs[job["guild_id"]]
+
+    async def _run_bulk_job(self, job: dict):
+        guild = self.bot.get_guild(job["guild_id"])
+        role = guild.get_role(job["role_id"]) if guild else None
+        channel = self.bot.get_channel(job["channel_id"])
+        progress_message = (
+            channel.get_partial_message(job["message_id"]) if channel else None
+        )
+        if role is None:
+            self.logger.warning(
+                f"Role or server of bulk role job {job['id']} is gone. Abandoning it."
+            )
+            await asyncio.to_thread(
+                db.update_bulk_role_job,
+                job["id"],
+                job["position"],
+                job["changed"],
+                job["unchanged"],
+                job["failed"],
+                time.time(),
+            )
+            return
+
+        targets = job["targets"]
+        # Changes run concurrently and finish out of order. Outcomes are held
+        # here until every earlier target is done, so a checkpoint always
+        # covers exactly the targets before job["position"].
+        outcomes = {}
+        pending = iter(range(job["position"], len(targets)))
+        session = (time.monotonic(), job["position"])
+        last_progress = time.monotonic()
+        checkpoint_lock = asyncio.Lock()
+        reason = f"Bulk role job #{job['id']}"
+
+        async def checkpoint(finished_at: float = None):
+            async with checkpoint_lock:
+                await asyncio.to_thread(
+                    db.update_bulk_role_job,
+                    job["id"],
+                    job["position"],
+                    job["changed"],
+                    job["unchanged"],
+                    dict(job["failed"]),
+                    finished_at,
+                )
+
+        async def worker():
+            nonlocal last_progress
+            for index in pending:
+                if job["cancelled"]:
+                    return
+                outcomes[index] = await self._apply_bulk_change(
+                    guild, role, job["action"], targets[index], reason
+                )
+                while job["position"] in outcomes:
+                    outcome = outcomes.pop(job["position"])
+                    if outcome is None:
+                        job["changed"] += 1
+                    elif outcome is False:
+                        job["unchanged"] += 1
+                    else:
+                        job["failed"][targets[job["position"]]] = outcome
+                    job["position"] += 1
+                if time.monotonic() - last_progress >= BULK_PROGRESS_INTERVAL:
+                    last_progress = time.monotonic()
+                    await checkpoint()
+                    if progress_message:
+                        # Coalesced by the REST scheduler; no need to wait for it.
+                        self.bot.rest.edit_message(
+                            progress_message,
+                            content=self._bulk_progress_text(job, role, session),
+                        )
+
+        await asyncio.gather(*(worker() for _ in range(BULK_CONCURRENCY)))
+        await checkpoint(finished_at=time.time())
+
+        summary = self._bulk_progress_text(job, role, session, finished=True)
+        self.logger.info(
+            f"Bulk role job {job['id']} ended: {job['changed']} changed, "
+            f"{job['unchanged']} already done, {len(job['failed'])} failed."
+        )
+        if progress_message:
+            try:
+                await self.bot.rest.edit_message(
+                    progress_message, content=summary[:2000]
+                )
+            except (discord.HTTPException, RequestShed) as e:
+                self.logger.error(f"Could not report bulk role job {job['id']}: {e}")
+
+        # The job's own role changes were only indexed; refresh the embed once.
+        self._forget_bulk_job(job)
+        if (
+            self.role_embed_message
+            and self.role_embed_message.guild
+            and self.role_embed_message.guild.id == guild.id
+        ):
+            await self._update_embed_now(guild, force=False)
+
+    async def _apply_bulk_change(
+        self,
+        guild: discord.Guild,
+        role: discord.Role,
+        action: str,
+        member_id: int,
+        reason: str,
+    ):
+        """
+        Adds or removes role for one member, retrying with backoff.
+        Returns None if the member was changed, False if there was nothing to
+        change (e.g. a target redone after a restart) or an error text.
+        """
+        member = guild.get_member(member_id)
+        if member is None:
+            return "not in the server anymore"
+        if (member.get_role(role.id) is not None) == (action == "add"):
+            return False
+        change = (
+            self.bot.rest.add_roles if action == "add" else self.bot.rest.remove_roles
+        )
+        return await retry_request(
+            lambda: change(member, role, reason=reason),
+            BULK_MAX_ATTEMPTS,
+            BULK_BACKOFF,
+        )
+
+    @staticmethod
+    def _bulk_progress_text(
+        job: dict, role: discord.Role, session: tuple, finished: bool = False
+    ) -> str:
+        total = len(job["targets"])
+        done = job["position"]
+        verb = "Assigning" if job["action"] == "add" else "Removing"
+        lines = [
+            f"**Bulk role job #{job['id']}**: {verb} `{role.name}`: "
+            f"{done}/{total} members ({done * 100 // total}%), "
+            f"{job['changed']} changed, {job['unchanged']} already done, "
+            f"{len(job['failed'])} failed."
+        ]
+        session_started, session_position = session
+        elapsed = time.monotonic() - session_started
+        if finished:
+            state = "Cancelled" if job["cancelled"] else "Finished"
+            lines.append(
+                f"{state} after {(time.time() - job['started_at']) / 60:.1f} min."
+            )
+            lines.extend(
+                f"<@{member_id}>: {error}"
+                for member_id, error in list(job["failed"].items())[:20]
+            )
+        elif done > session_position and elapsed > 0:
+            rate = (done - session_position) / elapsed
+            lines.append(f"About {(total - done) / rate / 60:.0f} min left.")
+        return "\n".join(lines)
 
     @role_tracker_commands.command(
         name="reset_embed",
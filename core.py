@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from discord.ext import commands
+import snapshot
+from jobscheduler import JobScheduler
+from loopwatchdog import LoopWatchdog
+from restscheduler import RestScheduler
+from statusapi import STATUS_API_HOST, STATUS_API_PORT, StatusAPI, StatusCache
+
+logger = logging.getLogger(__name__)
+
+
+class Flatool(commands.Bot):
+    """
+    The bot itself: a commands.Bot that also owns the process-wide services
+    the cogs share: the background job scheduler (bot.jobs), the outbound REST
+    scheduler (bot.rest), the event-loop stall detector (bot.watchdog), the
+    cached status views behind the optional status API (bot.status_cache) and the
+    warm-restart snapshot, written as a job and on graceful shutdown.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jobs = JobScheduler()
+        self.rest = RestScheduler()
+        self.watchdog = LoopWatchdog()
+        self.status_cache = StatusCache()
+        self.status_api = None
+        if STATUS_API_PORT:
+            self.status_api = StatusAPI(
+                self.status_cache, STATUS_API_HOST, STATUS_API_PORT
+            )
+        self.jobs.register(
+            "snapshot", self.save_snapshot, snapshot.INTERVAL, delay=snapshot.INTERVAL
+        )
+        # Jobs only run once the cache is ready; start() is a no-op on reconnects.
+        self.add_listener(self._start_jobs, "on_ready")
+
+    async def _start_jobs(self):
+        self.jobs.start()
+
+    async def start(self, *args, **kwargs):
+        self.watchdog.start()
+        if self.status_api:
+            await self.status_api.start()
+        await super().start(*args, **kwargs)
+
+    async def close(self):
+        await self.jobs.stop()
+        # Only a bot that got ready has state worth keeping; a failed boot
+        # must not overwrite the last good snapshot.
+        if self.is_ready():
+            snapshot.write(snapshot.collect(self))
+        await self.rest.stop()
+        await self.watchdog.stop()
+        if self.status_api:
+            await self.status_api.stop()
+        await super().close()
+
+    async def save_snapshot(self):
+        data = snapshot.collect(self)
+        await asyncio.to_thread(snapshot.write, data)
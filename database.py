@@ -32,6 +32,53 @@ def init():
             )
         """
         )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS broadcasts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            message TEXT,
+            origin_channel_id INTEGER,
+            targets TEXT,
+            delivered TEXT,
+            failed TEXT,
+            started_at REAL,
+            finished_at REAL
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS role_history (
+            role_id INTEGER,
+            tier TEXT,
+            start_ts INTEGER,
+            step INTEGER,
+            first_value INTEGER,
+            deltas BLOB,
+            PRIMARY KEY (role_id, tier, start_ts)
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bulk_role_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            role_id INTEGER,
+            action TEXT,
+            started_by INTEGER,
+            channel_id INTEGER,
+            message_id INTEGER,
+            targets TEXT,
+            position INTEGER DEFAULT 0,
+            changed INTEGER DEFAULT 0,
+            unchanged INTEGER DEFAULT 0,
+            failed TEXT DEFAULT '{}',
+            started_at REAL,
+            finished_at REAL
+            )
+        """
+        )
         conn.commit()
         conn.close()
         logger.info(f"Database '{DATABASE_FILE}' initialized successfully.")
@@ -203,7 +250,7 @@ def update_counting_value(new_value: int):
         cursor = conn.cursor()
         cursor.execute("UPDATE counting SET value = ?", (new_value,))
         conn.commit()
-        logger.info(f"Counting value updated to {new_value}.")
+        logger.debug("Counting value updated to %s.", new_value)
     except sqlite3.Error as e:
         logger.error(f"Error updating counting value: {e}", exc_info=True)
     finally:
@@ -211,5 +258,336 @@ def update_counting_value(new_value: int):
             conn.close()
 
 
+def create_broadcast(
+    message: str, origin_channel_id: int, targets: list, started_at: float
+):
+    """
+    Records a new broadcast run so it can be resumed after a restart.
+    Returns the id of the new row, or None on error.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO broadcasts
+            (message, origin_channel_id, targets, delivered, failed, started_at)
+            VALUES (?, ?, ?, '[]', '{}', ?)
+            """,
+            (message, origin_channel_id, json.dumps(targets), started_at),
+        )
+        conn.commit()
+        logger.info(
+            f"Broadcast {cursor.lastrowid} created with {len(targets)} targets."
+        )
+        return cursor.lastrowid
+    except sqlite3.Error as e:
+        logger.error(f"Error creating broadcast: {e}", exc_info=True)
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+def update_broadcast(
+    broadcast_id: int, delivered: list, failed: dict, finished_at: float = None
+):
+    """
+    Checkpoints the progress of a broadcast.
+    delivered is a list of channel ids, failed maps channel ids to error text.
+    Passing finished_at marks the broadcast as complete.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE broadcasts SET delivered = ?, failed = ?, finished_at = ? WHERE id = ?",
+            (json.dumps(delivered), json.dumps(failed), finished_at, broadcast_id),
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Error updating broadcast {broadcast_id}: {e}", exc_info=True)
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_unfinished_broadcasts() -> list:
+    """
+    Returns every broadcast that has not finished yet as a list of dicts,
+    with targets, delivered and failed already decoded.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id, message, origin_channel_id, targets, delivered, failed, started_at
+            FROM broadcasts WHERE finished_at IS NULL ORDER BY id
+            """
+        )
+        return [
+            {
+                "id": row[0],
+                "message": row[1],
+                "origin_channel_id": row[2],
+                "targets": json.loads(row[3]),
+                "delivered": json.loads(row[4]),
+                # JSON object keys are strings; channel ids are ints everywhere else
+                "failed": {int(k): v for k, v in json.loads(row[5]).items()},
+                "started_at": row[6],
+            }
+            for row in cursor.fetchall()
+        ]
+    except sqlite3.Error as e:
+        logger.error(f"Error retrieving unfinished broadcasts: {e}", exc_info=True)
+        return []
+    finally:
+        if conn:
+            conn.close()
+
+
+def save_history_block(
+    role_id: int, tier: str, start_ts: int, step: int, first_value: int, deltas: bytes
+):
+    """
+    Inserts or replaces one block of a role's membership history.
+    A block holds evenly spaced samples starting at start_ts, delta-encoded.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO role_history
+            (role_id, tier, start_ts, step, first_value, deltas)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (role_id, tier, start_ts, step, first_value, deltas),
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Error saving role history block: {e}", exc_info=True)
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_history_blocks(role_id: int, tier: str, since: int, until: int) -> list:
+    """
+    Returns the history blocks of a role and tier that start in [since, until),
+    oldest first, as (start_ts, step, first_value, deltas) tuples.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT start_ts, step, first_value, deltas FROM role_history
+            WHERE role_id = ? AND tier = ? AND start_ts >= ? AND start_ts < ?
+            ORDER BY start_ts
+            """,
+            (role_id, tier, since, until),
+        )
+        return cursor.fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"Error retrieving role history: {e}", exc_info=True)
+        return []
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_latest_history_block(role_id: int, tier: str):
+    """
+    Returns the newest history block of a role and tier as
+    (start_ts, step, first_value, deltas), or None if there is none.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT start_ts, step, first_value, deltas FROM role_history
+            WHERE role_id = ? AND tier = ? ORDER BY start_ts DESC LIMIT 1
+            """,
+            (role_id, tier),
+        )
+        return cursor.fetchone()
+    except sqlite3.Error as e:
+        logger.error(f"Error retrieving latest role history block: {e}", exc_info=True)
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_history_role_ids() -> list:
+    """Returns the ids of all roles that have recorded history."""
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT role_id FROM role_history")
+        return [row[0] for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        logger.error(f"Error retrieving role history ids: {e}", exc_info=True)
+        return []
+    finally:
+        if conn:
+            conn.close()
+
+
+def delete_history_blocks_before(tier: str, before_ts: int):
+    """Deletes every history block of a tier that starts before before_ts."""
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            "DELETE FROM role_history WHERE tier = ? AND start_ts < ?",
+            (tier, before_ts),
+        )
+        conn.commit()
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} '{tier}' role history blocks.")
+    except sqlite3.Error as e:
+        logger.error(f"Error pruning role history: {e}", exc_info=True)
+    finally:
+        if conn:
+            conn.close()
+
+
+def create_bulk_role_job(
+    guild_id: int,
+    role_id: int,
+    action: str,
+    started_by: int,
+    channel_id: int,
+    message_id: int,
+    targets: list,
+    started_at: float,
+):
+    """
+    Records a new bulk role job so it can be resumed after a restart.
+    action is 'add' or 'remove', targets the member ids to process in order.
+    Returns the id of the new row, or None on error.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO bulk_role_jobs
+            (guild_id, role_id, action, started_by, channel_id, message_id, targets, started_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                guild_id,
+                role_id,
+                action,
+                started_by,
+                channel_id,
+                message_id,
+                json.dumps(targets),
+                started_at,
+            ),
+        )
+        conn.commit()
+        logger.info(
+            f"Bulk role job {cursor.lastrowid} created with {len(targets)} targets."
+        )
+        return cursor.lastrowid
+    except sqlite3.Error as e:
+        logger.error(f"Error creating bulk role job: {e}", exc_info=True)
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+def update_bulk_role_job(
+    job_id: int,
+    position: int,
+    changed: int,
+    unchanged: int,
+    failed: dict,
+    finished_at: float = None,
+):
+    """
+    Checkpoints the progress of a bulk role job. Every target before position
+    has been processed and is accounted for in changed, unchanged and failed
+    (member id -> error text). Passing finished_at marks the job as complete.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            UPDATE bulk_role_jobs
+            SET position = ?, changed = ?, unchanged = ?, failed = ?, finished_at = ?
+            WHERE id = ?
+            """,
+            (position, changed, unchanged, json.dumps(failed), finished_at, job_id),
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Error updating bulk role job {job_id}: {e}", exc_info=True)
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_unfinished_bulk_role_jobs() -> list:
+    """
+    Returns every bulk role job that has not finished yet as a list of dicts,
+    with targets and failed already decoded.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id, guild_id, role_id, action, started_by, channel_id, message_id,
+                   targets, position, changed, unchanged, failed, started_at
+            FROM bulk_role_jobs WHERE finished_at IS NULL ORDER BY id
+            """
+        )
+        return [
+            {
+                "id": row[0],
+                "guild_id": row[1],
+                "role_id": row[2],
+                "action": row[3],
+                "started_by": row[4],
+                "channel_id": row[5],
+                "message_id": row[6],
+                "targets": json.loads(row[7]),
+                "position": row[8],
+                "changed": row[9],
+                "unchanged": row[10],
+                # JSON object keys are strings; member ids are ints everywhere else
+                "failed": {int(k): v for k, v in json.loads(row[11]).items()},
+                "started_at": row[12],
+            }
+            for row in cursor.fetchall()
+        ]
+    except sqlite3.Error as e:
+        logger.error(f"Error retrieving unfinished bulk role jobs: {e}", exc_info=True)
+        return []
+    finally:
+        if conn:
+            conn.close()
+
+
 # Initialize the database when this module is imported
 init()
@@ -1,20 +1,22 @@
 import os
 import logging
 import discord
-from discord.ext import commands
 from discord import SlashCommandGroup
 from dotenv import load_dotenv
+
+load_dotenv()  # before project modules, which read their settings from the environment
+
 import database as db
+import snapshot
+from core import Flatool
+from logconfig import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-)
+# Configure logging (queued, so handlers never write from the event loop)
+setup_logging()
 logger = logging.getLogger("flatool")
 
 # project modules
 
-load_dotenv()
 db.init()
 
 DEBUG_GUILDS = [
@@ -28,10 +30,12 @@ intents.message_content = True
 intents.guilds = True
 intents.guild_messages = True
 intents.members = True
-bot = commands.Bot(command_prefix="f!", intents=intents, debug_guilds=DEBUG_GUILDS)
+bot = Flatool(command_prefix="f!", intents=intents, debug_guilds=DEBUG_GUILDS)
 
 # load cogs
-cogs_list = ["misc", "roletracker", "counting", "cats"]
+cogs_list = ["misc", "roletracker", "counting", "cats", "backups"]
+if os.getenv("EVENT_RECORD_FILE"):
+    cogs_list.append("recorder")  # opt-in gateway event recording, see replay.py
 
 for cog in cogs_list:
     try:
@@ -40,6 +44,9 @@ for cog in cogs_list:
     except Exception as e:
         logger.error(f"Failed to load cog {cog}: {e}")
 
+# warm restart: serve from the last snapshot until cogs reconcile with live data
+snapshot.restore(bot, snapshot.load())
+
 
 # bot startup function
 @bot.event
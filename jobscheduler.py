@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds before the first retry of a failing job (or its interval, if shorter)
+RETRY_BASE = 60
+
+
+class Job:
+    """A periodic coroutine registered with the JobScheduler, plus its run history."""
+
+    def __init__(self, name, func, interval, jitter, max_backoff, next_run):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.next_run = next_run  # time.monotonic() value
+        self.running = False
+        self.runs = 0
+        self.failures = 0  # consecutive
+        self.last_duration = None
+        self.last_error = None
+
+    @property
+    def next_run_at(self) -> float:
+        """Unix timestamp of the next run, for display."""
+        return time.time() + max(0.0, self.next_run - time.monotonic())
+
+
+class JobScheduler:
+    """
+    Runs the bot's periodic background work.
+
+    Cogs register jobs by name instead of starting their own tasks.loop, so
+    reconnects (which fire on_ready again) can never start a job twice: a job
+    that is still running is not started again, and registering an existing
+    name only updates it. Each run is rescheduled with jitter; failing jobs
+    back off exponentially. At most max_concurrent jobs run at once.
+    """
+
+    def __init__(self, max_concurrent: int = 3):
+        self.jobs = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._dispatcher = None
+        self._wakeup = None
+        self._running = set()
+
+    def register(
+        self,
+        name: str,
+        func,
+        interval: float,
+        jitter: float = 0.1,
+        max_backoff: float = None,
+        delay: float = 0.0,
+    ):
+        """
+        Registers func (a coroutine function without arguments) to run every
+        interval seconds, first after delay seconds. jitter is the fraction of
+        the delay by which each run may be moved. A failing job is retried
+        after min(interval, 60s) * 2**(failures - 1), capped at max_backoff
+        (default 4 intervals).
+        """
+        job = self.jobs.get(name)
+        if job is not None:
+            job.func, job.interval, job.jitter = func, interval, jitter
+            job.max_backoff = max_backoff or interval * 4
+            return job
+        job = Job(
+            name,
+            func,
+            interval,
+            jitter,
+            max_backoff or interval * 4,
+            time.monotonic() + delay,
+        )
+        self.jobs[name] = job
+        if self._wakeup:
+            self._wakeup.set()
+        return job
+
+    def unregister(self, name: str):
+        self.jobs.pop(name, None)
+
+    def start(self):
+        """Starts dispatching. Safe to call repeatedly, e.g. from on_ready."""
+        if self._dispatcher and not self._dispatcher.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch(), name="job-scheduler")
+        logger.info(f"Job scheduler started with {len(self.jobs)} jobs.")
+
+    async def stop(self):
+        """Stops dispatching and cancels any job that is still running."""
+        tasks = list(self._running)
+        if self._dispatcher:
+            tasks.append(self._dispatcher)
+            self._dispatcher = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Job scheduler stopped.")
+
+    async def _dispatch(self):
+        while True:
+            now = time.monotonic()
+            wait = None
+            for job in list(self.jobs.values()):
+                if job.running:
+                    continue
+                if job.next_run <= now:
+                    job.running = True
+                    task = asyncio.create_task(self._run(job), name=f"job: {job.name}")
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+                else:
+                    remaining = job.next_run - now
+                    wait = remaining if wait is None else min(wait, remaining)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, job: Job):
+        try:
+            async with self._semaphore:
+                started = time.monotonic()
+                try:
+                    await job.func()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    job.failures += 1
+                    job.last_error = f"{type(e).__name__}: {e}"
+                    delay = min(
+                        min(job.interval, RETRY_BASE) * 2 ** (job.failures - 1),
+                        job.max_backoff,
+                    )
+                    logger.error(
+                        f"Job '{job.name}' failed ({job.failures} in a row), "
+                        f"retrying in {delay:.0f}s: {e}",
+                        exc_info=True,
+                    )
+                else:
+                    job.failures = 0
+                    job.last_error = None
+                    delay = job.interval
+                finished = time.monotonic()
+                job.runs += 1
+                job.last_duration = finished - started
+                job.next_run = finished + delay * (
+                    1 + random.uniform(-job.jitter, job.jitter)
+                )
+        finally:
+            job.running = False
+            if self._wakeup:
+                self._wakeup.set()
@@ -0,0 +1,120 @@
+import asyncio
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from collections import Counter
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as a single JSON object per line.
+    Aggregated counts passed via extra={"counts": ...} are kept as a field.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        counts = getattr(record, "counts", None)
+        if counts is not None:
+            payload["counts"] = counts
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Routes all logging through a queue so the event loop never blocks on
+    stderr. A listener thread does the formatting and writing.
+    LOG_LEVEL sets the root level, LOG_FORMAT=json switches to JSON lines.
+    """
+    level = os.getenv("LOG_LEVEL", "INFO").upper()
+    handler = logging.StreamHandler()
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    listener.start()
+    atexit.register(listener.stop)  # drain whatever is still queued on exit
+    return listener
+
+
+class LogAggregator:
+    """
+    Counts high-frequency events and logs one aggregated line per interval
+    instead of one line per event. Counting is a dict increment; nothing is
+    formatted unless the interval has elapsed and the level is enabled.
+    A window starts with its first count and is flushed by a timer on the
+    running event loop, so counts are logged on time even if traffic stops.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        name: str,
+        interval: float = 60.0,
+        level: int = logging.INFO,
+    ):
+        self.logger = logger
+        self.name = name
+        self.interval = interval
+        self.level = level
+        self._counts = Counter()
+        self._window_start = time.monotonic()
+        self._next_flush = self._window_start + interval
+        self._timer = None
+
+    def count(self, key: str, n: int = 1):
+        now = time.monotonic()
+        if not self._counts:
+            self._window_start = now
+            self._next_flush = now + self.interval
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None  # outside the bot, fall back to flushing on count
+            if loop is not None:
+                self._timer = loop.call_later(self.interval, self.flush)
+        self._counts[key] += n
+        if now >= self._next_flush:
+            self.flush(now)
+
+    def flush(self, now: float = None):
+        now = time.monotonic() if now is None else now
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._counts and self.logger.isEnabledFor(self.level):
+            counts = dict(self._counts)
+            self.logger.log(
+                self.level,
+                "%s in the last %.0fs: %s",
+                self.name,
+                now - self._window_start,
+                ", ".join(f"{key}={value}" for key, value in counts.items()),
+                extra={"counts": counts},
+            )
+        self._counts.clear()
+        self._window_start = now
+        self._next_flush = now + self.interval
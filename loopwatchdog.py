@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Loop lag (ms) above which the loop counts as stalled.
+STALL_THRESHOLD_MS = int(os.getenv("STALL_THRESHOLD_MS", 200))
+STACK_DEPTH = 20
+
+
+class Stall:
+    """One recorded stall: when it started, how long it lasted, what was running."""
+
+    __slots__ = ("started_at", "duration", "stack")
+
+    def __init__(self, started_at: float, duration: float, stack: str):
+        self.started_at = started_at
+        self.duration = duration
+        self.stack = stack
+
+
+class LoopWatchdog:
+    """
+    Measures event-loop lag continuously and records stalls.
+
+    A heartbeat task sleeps for a fixed interval and measures how late it
+    wakes up. A monitor thread watches that heartbeat; once it is overdue by
+    more than the threshold, the thread samples the loop thread's stack,
+    which is whatever synchronous work is blocking the loop at that moment.
+    When the heartbeat resumes, the stall is stored with its full duration
+    in a ring buffer of recent stalls.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = STALL_THRESHOLD_MS / 1000,
+        history: int = 50,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags = deque(maxlen=600)  # about one minute of samples
+        self.stalls = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._captured_stack = None
+        self._last_beat = time.monotonic()
+        self._loop_thread_id = None
+        self._task = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._task:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="loop-watchdog")
+        self._thread = threading.Thread(
+            target=self._monitor, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Loop watchdog started (stall threshold {self.threshold * 1000:.0f}ms)."
+        )
+
+    async def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def lag_percentiles(self):
+        """Returns (p50, p99, max) of recent loop lag in seconds."""
+        samples = sorted(self.lags)
+        if not samples:
+            return 0.0, 0.0, 0.0
+        return (
+            samples[len(samples) // 2],
+            samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+            samples[-1],
+        )
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._last_beat = now
+            self.lags.append(lag)
+            if lag >= self.threshold:
+                with self._lock:
+                    stack = self._captured_stack
+                    self._captured_stack = None
+                self._record(lag, stack)
+
+    def _record(self, lag: float, stack: str):
+        stall = Stall(time.time() - lag, lag, stack or "(stack not captured)")
+        self.stalls.append(stall)
+        first_line = stack.strip().splitlines()[-2].strip() if stack else "unknown"
+        logger.warning(f"Event loop stalled for {lag * 1000:.0f}ms in {first_line}")
+
+    def _monitor(self):
+        while not self._stop.wait(self.interval / 2):
+            overdue = time.monotonic() - self._last_beat - self.interval
+            if overdue < self.threshold:
+                continue
+            with self._lock:
+                if self._captured_stack is not None:
+                    continue  # already sampled this stall
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                self._captured_stack = "".join(
+                    traceback.format_stack(frame, limit=STACK_DEPTH)
+                )
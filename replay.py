@@ -0,0 +1,371 @@
+"""
+Replays a gateway event recording made by cogs/recorder.py into the bot's cogs.
+
+The cogs are loaded into a bot that never logs in: REST calls (message deletes,
+replies, the cat API) go to a stubbed HTTP layer and the database is a scratch
+copy. When the stream is exhausted, end-to-end handler throughput and latency
+percentiles are printed.
+
+Usage:
+    python replay.py events.jsonl.gz               # original speed
+    python replay.py events.jsonl.gz --speed 10    # 10x speed
+    python replay.py events.jsonl.gz --speed 0     # as fast as possible
+    python replay.py events.jsonl.gz --speed 0 --no-pacing  # handler cost only
+
+REST calls go through the bot's REST scheduler, so by default its local route
+pacing and load shedding apply; the report shows what the scheduler did.
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import random
+import tempfile
+import time
+from collections import Counter, defaultdict
+import discord
+import database as db
+from cogs.recorder import read_events
+from core import Flatool
+from restscheduler import Priority
+
+logger = logging.getLogger("replay")
+
+DEFAULT_COGS = "misc,roletracker,counting,cats"
+
+
+class StubHTTP:
+    """
+    Stands in for Discord's REST API (and the HTTP session the cogs borrow from
+    the bot). Every call is counted and optionally delayed by a fixed latency.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = Counter()
+
+    async def call(self, route: str):
+        self.calls[route] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def get(self, url, **kwargs):
+        return _StubResponse(self, "GET " + url)
+
+
+class _StubResponse:
+    status = 200
+
+    def __init__(self, http: StubHTTP, route: str):
+        self.http = http
+        self.route = route
+
+    async def __aenter__(self):
+        await self.http.call(self.route)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def json(self):
+        return [{"url": "https://cdn2.thecatapi.com/images/replay.jpg"}]
+
+
+class StubRole:
+    def __init__(self, role_id: int, position: int):
+        self.id = role_id
+        self.position = position
+        self.name = f"role-{role_id}"
+        self.mention = f"<@&{role_id}>"
+        self.members = []
+
+
+class StubGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self.name = f"guild-{guild_id}"
+        self._roles = {}
+        self._members = {}
+
+    @property
+    def roles(self):
+        return list(self._roles.values())
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    def role(self, role_id: int, position: int) -> StubRole:
+        role = self._roles.get(role_id)
+        if role is None:
+            role = self._roles[role_id] = StubRole(role_id, position)
+        role.position = position
+        return role
+
+    def get_role(self, role_id: int):
+        return self._roles.get(role_id)
+
+    def get_member(self, member_id: int):
+        return self._members.get(member_id)
+
+
+class StubMember:
+    def __init__(self, member_id: int, bot: bool, guild=None, roles=()):
+        self.id = member_id
+        self.bot = bot
+        self.guild = guild
+        self.roles = list(roles)
+        self.name = f"user-{member_id}"
+        self.display_name = self.name
+        self.mention = f"<@{member_id}>"
+
+    def __str__(self):
+        return self.name
+
+
+class StubChannel:
+    def __init__(self, channel_id: int, guild):
+        self.id = channel_id
+        self.guild = guild
+        self.name = f"channel-{channel_id}"
+        self.mention = f"<#{channel_id}>"
+
+
+class StubMessage:
+    def __init__(self, http: StubHTTP, message_id, channel, author, content):
+        self._http = http
+        self.id = message_id
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+
+    async def delete(self, *, delay=None, reason=None):
+        await self._http.call("DELETE message")
+
+    async def reply(self, content=None, **kwargs):
+        await self._http.call("POST message")
+
+
+class Replayer:
+    """
+    Feeds recorded events to the listeners the loaded cogs registered on the
+    bot, scheduling each event as its own task like the gateway would.
+    Latency is measured from the moment an event was due until every
+    listener for it has returned.
+    """
+
+    def __init__(self, bot, http: StubHTTP, speed: float, max_inflight: int):
+        self.bot = bot
+        self.http = http
+        self.speed = speed
+        self.latencies = defaultdict(list)
+        self.errors = 0
+        self.skipped = 0
+        self._inflight = asyncio.Semaphore(max_inflight)
+        self._tasks = set()
+        self._guilds = {}
+        self._channels = {}
+        self._message_ids = 0
+
+    def _guild(self, guild_id):
+        if guild_id is None:
+            return None
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            guild = self._guilds[guild_id] = StubGuild(guild_id)
+        return guild
+
+    def _channel(self, channel_id, guild):
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self._channels[channel_id] = StubChannel(channel_id, guild)
+        return channel
+
+    def build(self, event: dict):
+        """Turns a recorded event into (listener name, listener args)."""
+        guild = self._guild(event.get("g"))
+        if event["e"] == "m":
+            self._message_ids += 1
+            author = StubMember(event["a"], bool(event["b"]), guild)
+            channel = self._channel(event["c"], guild)
+            message = StubMessage(
+                self.http, self._message_ids, channel, author, event["x"]
+            )
+            return "on_message", (message,)
+        if event["e"] == "u":
+            before = StubMember(
+                event["a"],
+                bool(event["b"]),
+                guild,
+                [guild.role(*role) for role in event["r0"]],
+            )
+            after = StubMember(
+                event["a"],
+                bool(event["b"]),
+                guild,
+                [guild.role(*role) for role in event["r1"]],
+            )
+            guild._members[after.id] = after
+            return "on_member_update", (before, after)
+        return None, ()
+
+    async def run(self, events):
+        started = time.perf_counter()
+        for event in events:
+            name, args = self.build(event)
+            handlers = self.bot._event_handlers.get(name)
+            if not handlers:
+                self.skipped += 1
+                continue
+
+            if self.speed > 0:
+                due = started + event["t"] / 1000 / self.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self._inflight.acquire()
+            else:
+                await self._inflight.acquire()
+                due = time.perf_counter()
+
+            task = asyncio.create_task(self._dispatch(name, handlers, args, due))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+        return time.perf_counter() - started
+
+    async def _dispatch(self, name, handlers, args, due):
+        try:
+            results = await asyncio.gather(
+                *(handler(*args) for handler in handlers), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    self.errors += 1
+                    logger.debug("Handler for %s failed: %r", name, result)
+        finally:
+            self.latencies[name].append(time.perf_counter() - due)
+            self._inflight.release()
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def print_report(replayer: Replayer, elapsed: float, rest_stats: Counter, pacing: bool):
+    total = sum(len(values) for values in replayer.latencies.values())
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Replayed {total} events in {elapsed:.2f}s ({rate:.1f} events/s), "
+        f"{replayer.errors} handler errors, {replayer.skipped} events without listeners"
+    )
+    print(
+        f"{'event':<20}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms)"
+    )
+    for name, values in sorted(replayer.latencies.items()):
+        values.sort()
+        print(
+            f"{name:<20}{len(values):>8}"
+            f"{percentile(values, 0.50) * 1000:>10.3f}"
+            f"{percentile(values, 0.90) * 1000:>10.3f}"
+            f"{percentile(values, 0.99) * 1000:>10.3f}"
+            f"{values[-1] * 1000:>10.3f}"
+        )
+    calls = ", ".join(f"{route}={n}" for route, n in replayer.http.calls.most_common())
+    print(f"Stub REST calls: {calls or 'none'}")
+    shed = " ".join(
+        f"{priority.name.lower()}={rest_stats[f'shed_{priority.name.lower()}']}"
+        for priority in Priority
+    )
+    print(
+        f"REST scheduler (pacing {'on' if pacing else 'off'}): "
+        f"completed={rest_stats['completed']}, coalesced={rest_stats['coalesced']}, "
+        f"rate_limited={rest_stats['rate_limited']}, shed: {shed}"
+    )
+
+
+async def main(args):
+    header, events = read_events(args.recording)
+
+    # Never touch the real database: cogs get a scratch copy seeded from the header.
+    scratch = tempfile.TemporaryDirectory()
+    db.DATABASE_FILE = os.path.join(scratch.name, "flatool.db")
+    db.init()
+    if "counting" in header:
+        db.create_counting_row(
+            header["counting"]["channel"], header["counting"]["value"]
+        )
+
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+    bot = Flatool(command_prefix="f!", intents=intents)
+    bot.rest.pacing = not args.no_pacing
+    http = StubHTTP(args.http_latency / 1000)
+    bot.http._HTTPClient__session = http
+
+    for cog in args.cogs.split(","):
+        try:
+            bot.load_extension(f"cogs.{cog}")
+        except Exception as e:
+            logger.error(f"Failed to load cog {cog}: {e}")
+
+    replayer = Replayer(bot, http, args.speed, args.max_inflight)
+    try:
+        elapsed = await replayer.run(events)
+    finally:
+        await bot.rest.stop()
+        scratch.cleanup()
+    print_report(replayer, elapsed, bot.rest.stats, bot.rest.pacing)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded gateway event stream into the bot's cogs."
+    )
+    parser.add_argument("recording", help="Recording written by the recorder cog.")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Playback speed multiplier; 0 replays as fast as possible.",
+    )
+    parser.add_argument(
+        "--cogs", default=DEFAULT_COGS, help="Comma-separated cogs to load."
+    )
+    parser.add_argument(
+        "--http-latency",
+        type=float,
+        default=0.0,
+        help="Simulated latency of every stubbed REST call, in milliseconds.",
+    )
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=1000,
+        help="Maximum number of events being handled at once.",
+    )
+    parser.add_argument(
+        "--no-pacing",
+        action="store_true",
+        help="Turn off the REST scheduler's local route pacing, so that fast "
+        "replays measure handler cost rather than the hand-tuned bucket limits.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for cats.")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    random.seed(args.seed)
+    asyncio.run(main(args))
@@ -0,0 +1,333 @@
+import asyncio
+import enum
+import logging
+import random
+import time
+from collections import Counter, deque
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Local pacing per route kind: (requests, per seconds). This is a hand-tuned
+# approximation of Discord's limits, not the live bucket state: pycord's HTTP
+# client tracks the real buckets (X-RateLimit-*) and sleeps through and retries
+# 429s itself. The pacing only keeps the queue from handing pycord more than a
+# route can take, so that priorities are decided here rather than in its locks.
+ROUTE_LIMITS = {
+    "delete_message": (5, 1.0),
+    "edit_message": (5, 5.0),
+    "send_message": (5, 5.0),
+    # Role changes are limited per guild rather than per channel
+    "member_roles": (10, 10.0),
+}
+DEFAULT_ROUTE_LIMIT = (5, 5.0)
+# How long a route is paused after a 429 without Retry-After reaches us
+RATE_LIMIT_PAUSE = 5.0
+
+
+class Priority(enum.IntEnum):
+    """
+    Outbound request classes, most urgent first.
+    Interaction callbacks themselves (ctx.respond/defer) bypass the scheduler:
+    they have their own bucket and a hard 3 second deadline. INTERACTION is for
+    REST work done on behalf of an interaction, like /say's message.
+    """
+
+    INTERACTION = 0
+    MODERATION = 1
+    EMBED_EDIT = 2
+    COSMETIC = 3
+    BULK = 4  # long-running batch work, like bulk role changes
+
+
+class RequestShed(Exception):
+    """Raised to the caller when its request was dropped under pressure."""
+
+
+async def retry_request(submit, attempts: int, backoff: float):
+    """
+    Awaits submit() (a call queueing one REST request, like RestScheduler.send)
+    up to attempts times, sleeping backoff seconds before the first retry and
+    twice as long before each next one, with jitter. 4xx answers other than 429
+    are final. Returns None on success, else the last error as text.
+    """
+    delay = backoff
+    for attempt in range(1, attempts + 1):
+        try:
+            await submit()
+            return None
+        except discord.HTTPException as e:
+            error = f"{e.status} {e.text or type(e).__name__}"
+            if e.status < 500 and e.status != 429:
+                return error  # permissions, missing target, bad request: final
+        except (RequestShed, asyncio.TimeoutError) as e:
+            error = str(e) or type(e).__name__
+        if attempt < attempts:
+            await asyncio.sleep(delay * random.uniform(1.0, 1.5))
+            delay *= 2
+    return error
+
+
+class _Bucket:
+    """Token bucket pacing one route locally; blocked_until pauses it after a 429."""
+
+    def __init__(self, limit: int, per: float):
+        self.limit = limit
+        self.per = per
+        self.tokens = float(limit)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def delay(self, now: float) -> float:
+        """Seconds until this bucket can take another request (0 if ready)."""
+        self.tokens = min(
+            self.limit, self.tokens + (now - self.updated) * self.limit / self.per
+        )
+        self.updated = now
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * self.per / self.limit
+
+    def take(self):
+        self.tokens -= 1
+
+
+class _Request:
+    __slots__ = ("priority", "route", "factory", "coalesce_key", "future")
+
+    def __init__(self, priority, route, factory, coalesce_key, future):
+        self.priority = priority
+        self.route = route
+        self.factory = factory
+        self.coalesce_key = coalesce_key
+        self.future = future
+
+
+class RestScheduler:
+    """
+    Central queue for the bot's outbound Discord REST calls.
+
+    Requests are served strictly by priority class and paced per route, using
+    a local approximation of Discord's limits, so one busy channel cannot block
+    the others. Rate limits themselves are handled by pycord; a 429 that still
+    gets through (pycord gave up, or Cloudflare) fails the request and pauses
+    its route. A pending edit of a message is replaced by a newer edit of the
+    same message instead of queueing both. Under pressure COSMETIC and BULK
+    work is shed first; when the queue is full, the oldest request of the least
+    urgent class below the new one is evicted, and if there is none the new
+    request is shed.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_pending: int = 500,
+        high_water: int = 100,
+        pacing: bool = True,
+    ):
+        self.workers = workers
+        # False skips the local route pacing entirely, e.g. for replay benchmarks
+        self.pacing = pacing
+        self.max_pending = max_pending
+        self.high_water = high_water
+        self.stats = Counter()
+        self._queues = {priority: deque() for priority in Priority}
+        self._coalescable = {}
+        self._buckets = {}
+        self._tasks = []
+        self._wakeup = None
+
+    @property
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def start(self):
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"rest-scheduler-{n}")
+            for n in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Stops the workers; queued and in-flight requests fail with RequestShed."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for queue in self._queues.values():
+            while queue:
+                self._fail(queue.popleft(), RequestShed("REST scheduler stopped"))
+        self._coalescable.clear()
+
+    def submit(self, priority: Priority, route: tuple, factory, coalesce_key=None):
+        """
+        Queues factory() (a coroutine function making one REST call) and
+        returns a future for its result. route is (route kind, major id) and
+        selects the rate-limit bucket.
+        """
+        self.start()
+        if coalesce_key is not None and coalesce_key in self._coalescable:
+            # Only the newest version of a pending edit matters.
+            pending_request = self._coalescable[coalesce_key]
+            pending_request.factory = factory
+            self.stats["coalesced"] += 1
+            return pending_request.future
+
+        future = asyncio.get_running_loop().create_future()
+        request = _Request(priority, route, factory, coalesce_key, future)
+
+        if priority >= Priority.COSMETIC and self.pending >= self.high_water:
+            self._fail(request, RequestShed("REST queue under pressure"))
+            return future
+        if self.pending >= self.max_pending:
+            victim = self._evict_below(priority)
+            if victim is None:
+                self._fail(request, RequestShed("REST queue full"))
+                return future
+            self._fail(victim, RequestShed("Evicted by more urgent REST work"))
+
+        self._queues[priority].append(request)
+        if coalesce_key is not None:
+            self._coalescable[coalesce_key] = request
+        self._wakeup.set()
+        return future
+
+    def delete_message(self, message, priority: Priority = Priority.MODERATION):
+        return self.submit(
+            priority, ("delete_message", message.channel.id), message.delete
+        )
+
+    def edit_message(self, message, priority: Priority = Priority.EMBED_EDIT, **fields):
+        return self.submit(
+            priority,
+            ("edit_message", message.channel.id),
+            lambda: message.edit(**fields),
+            coalesce_key=("edit_message", message.id),
+        )
+
+    def send(
+        self, channel, content=None, priority: Priority = Priority.COSMETIC, **kwargs
+    ):
+        return self.submit(
+            priority,
+            ("send_message", channel.id),
+            lambda: channel.send(content, **kwargs),
+        )
+
+    def reply(
+        self, message, content=None, priority: Priority = Priority.COSMETIC, **kwargs
+    ):
+        return self.submit(
+            priority,
+            ("send_message", message.channel.id),
+            lambda: message.reply(content, **kwargs),
+        )
+
+    def add_roles(
+        self, member, *roles, priority: Priority = Priority.BULK, reason=None
+    ):
+        return self.submit(
+            priority,
+            ("member_roles", member.guild.id),
+            lambda: member.add_roles(*roles, reason=reason),
+        )
+
+    def remove_roles(
+        self, member, *roles, priority: Priority = Priority.BULK, reason=None
+    ):
+        return self.submit(
+            priority,
+            ("member_roles", member.guild.id),
+            lambda: member.remove_roles(*roles, reason=reason),
+        )
+
+    def _fail(self, request: _Request, exc: Exception):
+        if isinstance(exc, RequestShed):
+            self.stats[f"shed_{request.priority.name.lower()}"] += 1
+        if self._coalescable.get(request.coalesce_key) is request:
+            del self._coalescable[request.coalesce_key]
+        if not request.future.done():
+            request.future.set_exception(exc)
+            # Not every caller awaits its future; don't warn about unretrieved errors.
+            request.future.exception()
+
+    def _evict_below(self, priority: Priority):
+        for candidate in reversed(Priority):
+            if candidate <= priority:
+                return None
+            if self._queues[candidate]:
+                return self._queues[candidate].popleft()
+        return None
+
+    def _bucket(self, route: tuple) -> _Bucket:
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            limit, per = ROUTE_LIMITS.get(route[0], DEFAULT_ROUTE_LIMIT)
+            bucket = self._buckets[route] = _Bucket(limit, per)
+        return bucket
+
+    def _next_request(self):
+        """
+        Pops the most urgent request whose route is ready.
+        Returns (request, None) or (None, seconds until one could be ready).
+        """
+        now = time.monotonic()
+        wait = None
+        for priority in Priority:
+            queue = self._queues[priority]
+            for index, request in enumerate(queue):
+                delay = self._bucket(request.route).delay(now) if self.pacing else 0
+                if delay == 0:
+                    del queue[index]
+                    self._bucket(request.route).take()
+                    if self._coalescable.get(request.coalesce_key) is request:
+                        del self._coalescable[request.coalesce_key]
+                    return request, None
+                wait = delay if wait is None else min(wait, delay)
+        return None, wait
+
+    async def _worker(self):
+        while True:
+            request, wait = self._next_request()
+            if request is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(request)
+
+    async def _run(self, request: _Request):
+        if request.future.done():  # caller gave up while it was queued
+            return
+        try:
+            result = await request.factory()
+        except asyncio.CancelledError:
+            # stop() cancelled the worker mid-request; don't leave the caller waiting.
+            self._fail(request, RequestShed("REST scheduler stopped"))
+            raise
+        except discord.HTTPException as e:
+            if e.status == 429:
+                pause = RATE_LIMIT_PAUSE
+                if e.response is not None:
+                    pause = float(e.response.headers.get("Retry-After", pause))
+                self._bucket(request.route).blocked_until = time.monotonic() + pause
+                self.stats["rate_limited"] += 1
+                logger.warning(
+                    "Route %s still rate limited after pycord's retries, "
+                    "pausing it for %.2fs.",
+                    request.route,
+                    pause,
+                )
+            self._fail(request, e)
+        except Exception as e:
+            self._fail(request, e)
+        else:
+            self.stats["completed"] += 1
+            if not request.future.done():
+                request.future.set_result(result)
@@ -0,0 +1,187 @@
+import logging
+import time
+from array import array
+from datetime import datetime, timezone
+import database as db
+
+logger = logging.getLogger(__name__)
+
+# (tier, seconds per sample, retention in seconds, samples per block)
+# Samples roll up raw -> hourly -> daily. Retention bounds the storage per role:
+# at 4 bytes per sample that is about 2.3 KB raw + 8.6 KB hourly + 7.3 KB daily.
+TIERS = [
+    ("raw", 300, 2 * 86400, 288),
+    ("hourly", 3600, 90 * 86400, 168),
+    ("daily", 86400, 5 * 365 * 86400, 366),
+]
+TIER_CONFIG = {name: (step, retention, size) for name, step, retention, size in TIERS}
+CHART_LEVELS = " ▁▂▃▄▅▆▇█"
+
+
+def encode(values: list):
+    """Delta-encodes a list of ints into (first value, packed int32 deltas)."""
+    deltas = array("i", (b - a for a, b in zip(values, values[1:])))
+    return values[0], deltas.tobytes()
+
+
+def decode(first_value: int, blob: bytes) -> list:
+    deltas = array("i")
+    deltas.frombytes(blob)
+    values = [first_value]
+    for delta in deltas:
+        values.append(values[-1] + delta)
+    return values
+
+
+class _Block:
+    __slots__ = ("start_ts", "step", "values")
+
+    def __init__(self, start_ts: int, step: int, values: list):
+        self.start_ts = start_ts
+        self.step = step
+        self.values = values
+
+    @property
+    def end_ts(self) -> int:
+        return self.start_ts + len(self.values) * self.step
+
+
+class RoleHistory:
+    """
+    Compact time series of member counts per role, stored in SQLite.
+
+    Samples are kept in blocks of evenly spaced, delta-encoded int32 values, one
+    row per block, so a year of daily samples is a single row. The block each
+    series is currently appending to stays in memory. All methods do blocking
+    database work and are meant to be called through asyncio.to_thread.
+    """
+
+    def __init__(self):
+        self._open = {}  # (role_id, tier) -> _Block being appended to
+
+    def record(self, counts: dict, now: float = None):
+        """Stores one raw sample per role from a {role_id: member_count} mapping."""
+        now = int(time.time() if now is None else now)
+        step = TIER_CONFIG["raw"][0]
+        for role_id, count in counts.items():
+            self._append(role_id, "raw", now - now % step, count)
+
+    def rollup(self, now: float = None):
+        """
+        Downsamples every finished hour and day into the coarser tiers,
+        then prunes blocks past their tier's retention.
+        """
+        now = int(time.time() if now is None else now)
+        for role_id in db.get_history_role_ids():
+            for (source, _, _, _), (target, target_step, _, _) in zip(TIERS, TIERS[1:]):
+                latest = self._latest(role_id, target)
+                until = now - now % target_step  # only complete buckets
+                since = latest.end_ts if latest else 0
+                buckets = {}
+                for ts, value in self._samples(role_id, source, since, until):
+                    buckets.setdefault(ts - ts % target_step, []).append(value)
+                for bucket_ts in sorted(buckets):
+                    values = buckets[bucket_ts]
+                    self._append(
+                        role_id, target, bucket_ts, round(sum(values) / len(values))
+                    )
+        for tier, step, retention, size in TIERS:
+            # A block is only dropped once its newest sample is past retention.
+            db.delete_history_blocks_before(tier, now - retention - step * size)
+
+    def query(self, role_id: int, since: float, until: float = None) -> list:
+        """
+        Returns [(timestamp, member_count)] for a role between since and until,
+        read from the finest tier whose retention still covers since.
+        """
+        until = int(time.time() if until is None else until)
+        since = int(since)
+        for tier, step, retention, size in TIERS:
+            if until - since <= retention or tier == TIERS[-1][0]:
+                break
+        points = self._samples(role_id, tier, since, until)
+        if tier != "raw":
+            # Coarse tiers lag behind; end the series on the latest raw sample.
+            latest = self._latest(role_id, "raw")
+            if latest and (not points or latest.end_ts - latest.step > points[-1][0]):
+                points.append((latest.end_ts - latest.step, latest.values[-1]))
+        return points
+
+    def _samples(self, role_id: int, tier: str, since: int, until: int) -> list:
+        step, _, size = TIER_CONFIG[tier]
+        points = []
+        # Blocks starting up to one block span earlier may still reach into the range.
+        for start_ts, block_step, first_value, deltas in db.get_history_blocks(
+            role_id, tier, since - step * size, until
+        ):
+            for index, value in enumerate(decode(first_value, deltas)):
+                ts = start_ts + index * block_step
+                if since <= ts < until:
+                    points.append((ts, value))
+        return points
+
+    def _latest(self, role_id: int, tier: str):
+        block = self._open.get((role_id, tier))
+        if block is None:
+            row = db.get_latest_history_block(role_id, tier)
+            if row is None:
+                return None
+            start_ts, step, first_value, deltas = row
+            block = _Block(start_ts, step, decode(first_value, deltas))
+            self._open[(role_id, tier)] = block
+        return block
+
+    def _append(self, role_id: int, tier: str, ts: int, value: int):
+        step, _, size = TIER_CONFIG[tier]
+        block = self._latest(role_id, tier)
+        if block is not None and ts < block.end_ts:
+            return  # already sampled this slot, e.g. right after a restart
+        if block is None or ts != block.end_ts or len(block.values) >= size:
+            # A gap (bot offline) or a full block starts a new block.
+            block = _Block(ts, step, [value])
+            self._open[(role_id, tier)] = block
+        else:
+            block.values.append(value)
+        db.save_history_block(
+            role_id, tier, block.start_ts, step, *encode(block.values)
+        )
+
+
+def render_chart(points: list, width: int = 40, height: int = 6) -> str:
+    """
+    Renders [(timestamp, value)] as a block-character chart for a code block.
+    Returns an empty string if there are no points.
+    """
+    if not points:
+        return ""
+    # Average the points into at most `width` columns.
+    columns = []
+    per_column = len(points) / min(width, len(points))
+    for column in range(min(width, len(points))):
+        chunk = points[int(column * per_column) : int((column + 1) * per_column)]
+        columns.append(sum(value for _, value in chunk) / len(chunk))
+
+    low, high = min(columns), max(columns)
+    span = (high - low) or 1
+    label_width = len(str(round(high)))
+    eighths = [round((value - low) / span * (height * 8 - 1)) + 1 for value in columns]
+
+    lines = []
+    for row in range(height - 1, -1, -1):
+        if row == height - 1:
+            label = str(round(high))
+        elif row == 0:
+            label = str(round(low))
+        else:
+            label = ""
+        cells = "".join(
+            CHART_LEVELS[min(8, max(0, level - row * 8))] for level in eighths
+        )
+        lines.append(f"{label:>{label_width}} │{cells}")
+
+    first = datetime.fromtimestamp(points[0][0], timezone.utc).strftime("%Y-%m-%d")
+    last = datetime.fromtimestamp(points[-1][0], timezone.utc).strftime("%Y-%m-%d")
+    axis_width = max(len(columns), len(first) + len(last) + 1)
+    lines.append(" " * label_width + " └" + "─" * len(columns))
+    lines.append(" " * (label_width + 2) + first + last.rjust(axis_width - len(first)))
+    return "\n".join(lines)
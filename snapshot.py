@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+import time
+
+# Set up a logger for the snapshot module
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "data/snapshot.json"
+SNAPSHOT_VERSION = 1
+# Snapshots older than this (seconds) are ignored at boot.
+MAX_AGE = int(os.getenv("SNAPSHOT_MAX_AGE", 900))
+# How often (seconds) a snapshot is written while the bot is running.
+INTERVAL = int(os.getenv("SNAPSHOT_INTERVAL", 300))
+
+
+def collect(bot) -> dict:
+    """
+    Gathers the warm-restart state of every cog that implements snapshot_state().
+    Must run on the event loop, since it reads live cog state.
+    """
+    sections = {}
+    for name, cog in bot.cogs.items():
+        snapshot_state = getattr(cog, "snapshot_state", None)
+        if snapshot_state is None:
+            continue
+        try:
+            sections[name] = snapshot_state()
+        except Exception as e:
+            logger.error(f"Failed to snapshot cog {name}: {e}", exc_info=True)
+    return {"v": SNAPSHOT_VERSION, "saved_at": time.time(), "cogs": sections}
+
+
+def write(data: dict) -> int:
+    """
+    Atomically writes a collected snapshot to SNAPSHOT_FILE.
+    Returns the number of bytes written, or 0 on failure.
+    """
+    tmp_path = SNAPSHOT_FILE + ".tmp"
+    try:
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        os.makedirs(os.path.dirname(SNAPSHOT_FILE) or ".", exist_ok=True)
+        with open(tmp_path, "wb") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, SNAPSHOT_FILE)
+        logger.info(f"Snapshot written to '{SNAPSHOT_FILE}' ({len(payload)} bytes).")
+        return len(payload)
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Error writing snapshot: {e}", exc_info=True)
+        return 0
+
+
+def load(max_age: int = MAX_AGE):
+    """
+    Reads the snapshot from SNAPSHOT_FILE.
+    Returns None if it is missing, unreadable, from another format version or
+    older than max_age seconds; stale state is never served.
+    """
+    try:
+        with open(SNAPSHOT_FILE, "rb") as fh:
+            data = json.loads(fh.read())
+    except FileNotFoundError:
+        logger.info("No snapshot found, starting cold.")
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable snapshot: {e}")
+        return None
+
+    if data.get("v") != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring snapshot with version {data.get('v')}.")
+        return None
+    age = time.time() - data.get("saved_at", 0)
+    if age < 0 or age > max_age:
+        logger.info(f"Ignoring snapshot that is {age:.0f}s old (max {max_age}s).")
+        return None
+    data["age"] = age
+    return data
+
+
+def restore(bot, data: dict):
+    """
+    Hands each cog its section of a loaded snapshot via restore_snapshot(state, age).
+    Cogs are expected to validate the state and reconcile it with live data later.
+    """
+    if not data:
+        return
+    for name, state in data.get("cogs", {}).items():
+        cog = bot.get_cog(name)
+        restore_snapshot = getattr(cog, "restore_snapshot", None)
+        if restore_snapshot is None:
+            continue
+        try:
+            restore_snapshot(state, data["age"])
+            logger.info(f"Restored {name} from a {data['age']:.0f}s old snapshot.")
+        except Exception as e:
+            logger.error(
+                f"Failed to restore cog {name} from snapshot: {e}", exc_info=True
+            )
@@ -78,4 +78,5 @@ echo "You can check its logs with: docker logs -f $CONTAINER_NAME"
 echo "To stop the container: docker stop $CONTAINER_NAME"
 echo "To remove the container: docker rm $CONTAINER_NAME"
 echo "To remove the volume (be careful, this deletes your data!): docker volume rm $VOLUME_NAME"
+echo "Database backups are taken online into $(dirname "$DB_CONTAINER_PATH")/backups (use /backup to take one now)."
 echo "---"
\ No newline at end of file
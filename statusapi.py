@@ -0,0 +1,98 @@
+import hashlib
+import json
+import logging
+import os
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# The HTTP server only runs when STATUS_API_PORT is set.
+STATUS_API_HOST = os.getenv("STATUS_API_HOST", "127.0.0.1")
+STATUS_API_PORT = int(os.getenv("STATUS_API_PORT", 0))
+
+
+class StatusCache:
+    """
+    Serialized JSON views of the bot's in-memory state.
+
+    Cogs register a provider per view and call invalidate() when the state
+    behind it changes, which only drops the cached payload. The body and its
+    ETag are rebuilt on the next request, so state that changes many times
+    between two polls is serialized once, and unchanged state never is.
+    """
+
+    def __init__(self):
+        self._providers = {}
+        self._payloads = {}  # name -> (body, etag)
+
+    @property
+    def names(self) -> list:
+        return sorted(self._providers)
+
+    def register(self, name: str, provider):
+        """provider() must return a JSON-serializable object."""
+        self._providers[name] = provider
+        self._payloads.pop(name, None)
+
+    def unregister(self, name: str):
+        self._providers.pop(name, None)
+        self._payloads.pop(name, None)
+
+    def invalidate(self, name: str):
+        self._payloads.pop(name, None)
+
+    def get(self, name: str):
+        """Returns (body, etag) for a view, or None if there is no such view."""
+        payload = self._payloads.get(name)
+        if payload is None:
+            provider = self._providers.get(name)
+            if provider is None:
+                return None
+            body = json.dumps(provider(), separators=(",", ":")).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+            payload = self._payloads[name] = (body, etag)
+        return payload
+
+
+class StatusAPI:
+    """
+    Read-only HTTP/JSON endpoint for dashboards, served on the bot's own loop.
+    GET /status lists the views, GET /status/<name> returns one of them.
+    Clients polling with If-None-Match get a bodyless 304 while nothing changed.
+    """
+
+    def __init__(self, cache: StatusCache, host: str, port: int):
+        self.cache = cache
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/status", self._index)
+        app.router.add_get("/status/{name}", self._view)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Status API listening on http://{self.host}:{self.port}/status")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _index(self, request: web.Request) -> web.Response:
+        return web.json_response({"views": self.cache.names})
+
+    async def _view(self, request: web.Request) -> web.Response:
+        payload = self.cache.get(request.match_info["name"])
+        if payload is None:
+            raise web.HTTPNotFound()
+        body, etag = payload
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("If-None-Match", "")
+        if if_none_match.strip() == "*" or etag in (
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        ):
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type="application/json", headers=headers)
@@ -0,0 +1,330 @@
+import asyncio
+import time
+import aiohttp
+import discord
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from restscheduler import Priority, RequestShed, RestScheduler, retry_request
+
+
+class MockDiscord:
+    """
+    A tiny local stand-in for Discord's REST API. It records every request
+    it receives and answers 429 on /ratelimited, like Discord does when a
+    rate limit gets past pycord.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.retry_after = "0.3"
+        self.session = None
+        self.server = None
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/channels/{channel_id}/messages", self._record)
+        app.router.add_patch(
+            "/channels/{channel_id}/messages/{message_id}", self._record
+        )
+        app.router.add_post("/ratelimited", self._rate_limited)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = aiohttp.ClientSession()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+        await self.server.close()
+
+    async def _record(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.calls.append((request.method, request.path, body, time.monotonic()))
+        return web.json_response(body)
+
+    async def _rate_limited(self, request: web.Request) -> web.Response:
+        self.calls.append((request.method, request.path, None, time.monotonic()))
+        return web.json_response(
+            {"message": "You are being rate limited.", "retry_after": 0.3},
+            status=429,
+            headers={"Retry-After": self.retry_after},
+        )
+
+    async def call(self, method: str, path: str, body: dict = None):
+        """Makes one request the way pycord does: HTTP errors raise HTTPException."""
+        async with self.session.request(
+            method, self.server.make_url(path), json=body
+        ) as response:
+            data = await response.json()
+            if response.status >= 400:
+                raise discord.HTTPException(response, data)
+            return data
+
+    def factory(self, method: str, path: str, body: dict = None):
+        return lambda: self.call(method, path, body)
+
+
+class StubChannel:
+    def __init__(self, api: MockDiscord, channel_id: int):
+        self.api = api
+        self.id = channel_id
+
+
+class StubMessage:
+    def __init__(self, channel: StubChannel, message_id: int):
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, **fields):
+        return await self.channel.api.call(
+            "PATCH", f"/channels/{self.channel.id}/messages/{self.id}", fields
+        )
+
+
+def run(test):
+    """Runs an async test body on a fresh event loop."""
+    return asyncio.run(test())
+
+
+def test_requests_are_served_by_priority():
+    async def test():
+        async with MockDiscord() as api:
+            scheduler = RestScheduler(workers=1)
+            # Nothing runs before the first await, so all four are queued together.
+            futures = [
+                scheduler.submit(
+                    priority,
+                    ("send_message", priority.value),
+                    api.factory("POST", f"/channels/{priority.value}/messages", {}),
+                )
+                for priority in reversed(list(Priority))
+            ]
+            await asyncio.gather(*futures)
+            await scheduler.stop()
+            served = [int(path.split("/")[2]) for _, path, _, _ in api.calls]
+            assert served == sorted(priority.value for priority in Priority)
+
+    run(test)
+
+
+def test_pending_edits_coalesce_to_the_newest():
+    async def test():
+        async with MockDiscord() as api:
+            scheduler = RestScheduler(workers=1)
+            message = StubMessage(StubChannel(api, 1), 10)
+            futures = [
+                scheduler.edit_message(message, content=f"version {n}")
+                for n in range(1, 4)
+            ]
+            results = await asyncio.gather(*futures)
+            await scheduler.stop()
+            assert [body for _, _, body, _ in api.calls] == [{"content": "version 3"}]
+            assert results == [{"content": "version 3"}] * 3
+            assert scheduler.stats["coalesced"] == 2
+
+    run(test)
+
+
+def test_cosmetic_work_is_shed_above_high_water():
+    async def test():
+        async with MockDiscord() as api:
+            scheduler = RestScheduler(workers=1, high_water=2)
+            urgent = [
+                scheduler.submit(
+                    Priority.INTERACTION,
+                    ("send_message", 1),
+                    api.factory("POST", "/channels/1/messages", {"n": n}),
+                )
+                for n in range(2)
+            ]
+            cosmetic = scheduler.submit(
+                Priority.COSMETIC,
+                ("send_message", 2),
+                api.factory("POST", "/channels/2/messages", {}),
+            )
+            moderation = scheduler.submit(
+                Priority.MODERATION,
+                ("send_message", 3),
+                api.factory("POST", "/channels/3/messages", {}),
+            )
+            with pytest.raises(RequestShed):
+                await cosmetic
+            await asyncio.gather(*urgent, moderation)
+            await scheduler.stop()
+            assert scheduler.stats["shed_cosmetic"] == 1
+            assert "/channels/2/messages" not in [path for _, path, _, _ in api.calls]
+
+    run(test)
+
+
+def test_least_urgent_request_is_evicted_at_max_pending():
+    async def test():
+        async with MockDiscord() as api:
+            scheduler = RestScheduler(workers=1, max_pending=3, high_water=100)
+            cosmetic = [
+                scheduler.submit(
+                    Priority.COSMETIC,
+                    ("send_message", 1),
+                    api.factory("POST", "/channels/1/messages", {"n": n}),
+                )
+                for n in range(3)
+            ]
+            interaction = scheduler.submit(
+                Priority.INTERACTION,
+                ("send_message", 2),
+                api.factory("POST", "/channels/2/messages", {}),
+            )
+            await interaction
+            with pytest.raises(RequestShed):
+                await cosmetic[0]  # the oldest of the least urgent class
+            await asyncio.gather(*cosmetic[1:])
+            await scheduler.stop()
+            assert [body for _, _, body, _ in api.calls] == [{}, {"n": 1}, {"n": 2}]
+
+    run(test)
+
+
+def test_new_request_is_shed_when_nothing_less_urgent_is_queued():
+    async def test():
+        async with MockDiscord() as api:
+            scheduler = RestScheduler(workers=1, max_pending=2, high_water=100)
+            queued = [
+                scheduler.submit(
+                    Priority.INTERACTION,
+                    ("send_message", 1),
+                    api.factory("POST", "/channels/1/messages", {}),
+                )
+                for _ in range(2)
+            ]
+            late = scheduler.submit(
+                Priority.MODERATION,
+                ("send_message", 2),
+                api.factory("POST", "/channels/2/messages", {}),
+            )
+            with pytest.raises(RequestShed):
+                await late
+            await asyncio.gather(*queued)
+            await scheduler.stop()
+
+    run(test)
+
+
+def test_429_fails_the_request_and_pauses_its_route():
+    async def test():
+        async with MockDiscord() as api:
+            scheduler = RestScheduler(workers=2)
+            limited = scheduler.submit(
+                Priority.INTERACTION,
+                ("send_message", 1),
+                api.factory("POST", "/ratelimited"),
+            )
+            with pytest.raises(discord.HTTPException) as raised:
+                await limited
+            assert raised.value.status == 429
+            rate_limited_at = api.calls[0][3]
+
+            same_route = scheduler.submit(
+                Priority.INTERACTION,
+                ("send_message", 1),
+                api.factory("POST", "/channels/1/messages", {}),
+            )
+            other_route = scheduler.submit(
+                Priority.INTERACTION,
+                ("send_message", 2),
+                api.factory("POST", "/channels/2/messages", {}),
+            )
+            await asyncio.gather(same_route, other_route)
+            await scheduler.stop()
+
+            served_at = {path: at for _, path, _, at in api.calls}
+            # The paused route waits out Retry-After; other routes are unaffected.
+            assert served_at["/channels/1/messages"] - rate_limited_at >= 0.3
+            assert served_at["/channels/2/messages"] - rate_limited_at < 0.3
+            assert scheduler.stats["rate_limited"] == 1
+
+    run(test)
+
+
+def test_stop_fails_queued_and_in_flight_requests():
+    async def test():
+        scheduler = RestScheduler(workers=1)
+        started = asyncio.Event()
+
+        async def slow_request():
+            started.set()
+            await asyncio.sleep(10)
+
+        in_flight = scheduler.submit(
+            Priority.INTERACTION, ("send_message", 1), slow_request
+        )
+        queued = scheduler.submit(
+            Priority.INTERACTION, ("send_message", 1), slow_request
+        )
+        await started.wait()
+        await scheduler.stop()
+        for future in (in_flight, queued):
+            with pytest.raises(RequestShed):
+                await asyncio.wait_for(future, timeout=1)
+
+    run(test)
+
+
+def test_pacing_can_be_turned_off():
+    async def test():
+        async with MockDiscord() as api:
+            scheduler = RestScheduler(workers=4, pacing=False)
+            # Twice the send_message bucket size; paced, the second half would wait.
+            started = time.monotonic()
+            await asyncio.gather(
+                *(
+                    scheduler.submit(
+                        Priority.INTERACTION,
+                        ("send_message", 1),
+                        api.factory("POST", "/channels/1/messages", {"n": n}),
+                    )
+                    for n in range(10)
+                )
+            )
+            await scheduler.stop()
+            assert len(api.calls) == 10
+            assert time.monotonic() - started < 0.5
+
+    run(test)
+
+
+class FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "fake"
+
+
+def failing_then_ok(*errors):
+    """A submit() that raises the given errors in turn, then succeeds."""
+    calls = []
+
+    async def submit():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+
+    return submit, calls
+
+
+def test_retry_request_retries_server_errors_rate_limits_and_shedding():
+    submit, calls = failing_then_ok(
+        discord.HTTPException(FakeResponse(500), "server error"),
+        discord.HTTPException(FakeResponse(429), "rate limited"),
+        RequestShed("REST queue under pressure"),
+    )
+    assert asyncio.run(retry_request(submit, attempts=5, backoff=0)) is None
+    assert len(calls) == 4
+
+
+def test_retry_request_gives_up_on_client_errors_and_after_attempts():
+    submit, calls = failing_then_ok(discord.Forbidden(FakeResponse(403), "no"))
+    assert asyncio.run(retry_request(submit, attempts=5, backoff=0)) == "403 no"
+    assert len(calls) == 1
+
+    submit, calls = failing_then_ok(*[RequestShed("shed")] * 5)
+    assert asyncio.run(retry_request(submit, attempts=3, backoff=0)) == "shed"
+    assert len(calls) == 3